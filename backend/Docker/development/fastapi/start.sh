@@ -6,4 +6,10 @@ set -o nounset
 
 set -o pipefail
 
-exec uvicorn backend.app.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+# Requests arrive through traefik; trust its X-Forwarded-For so request.client
+# is the real client (the per-client auth rate limit depends on it). If traefik
+# does not resolve, only loopback is trusted
+FORWARDED_ALLOW_IPS="${FORWARDED_ALLOW_IPS:-$(getent hosts traefik | awk '{ print $1 }' || true)}"
+
+exec uvicorn backend.app.main:app --host 0.0.0.0 --port 8000 --reload \
+    --proxy-headers --forwarded-allow-ips "${FORWARDED_ALLOW_IPS:-127.0.0.1}"
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from backend.app.api.routes import home
 from backend.app.api.routes.auth import (
     register,
@@ -9,14 +9,27 @@ from backend.app.api.routes.auth import (
     refresh,
     logout,
 )
+from backend.app.core.rate_limit import auth_rate_limit
 
 api_router = APIRouter()
 
 api_router.include_router(home.router)
-api_router.include_router(register.router)
-api_router.include_router(activate.router)
-api_router.include_router(login.router)
+
+# Credential endpoints are unauthenticated and expensive (Argon2, OTP emails,
+# DB writes), so they share a per-client rate limit that rejects floods before
+# any handler runs
+credential_routers = (
+    register.router,
+    activate.router,
+    login.router,
+    password_reset.router,
+)
+for credential_router in credential_routers:
+    api_router.include_router(
+        credential_router, dependencies=[Depends(auth_rate_limit)]
+    )
+
+# Token refresh, logout and the OAuth callback are part of normal sessions
 api_router.include_router(google.router)
-api_router.include_router(password_reset.router)
 api_router.include_router(refresh.router)
 api_router.include_router(logout.router)
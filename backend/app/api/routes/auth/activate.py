@@ -1,6 +1,6 @@
 from fastapi import APIRouter, status, HTTPException
-from backend.app.core.db import SessionDep
-from backend.app.core.i18n import _
+from backend.app.core.db import SessionDep, scoped_session
+from backend.app.core.i18n import _, N_, get_current_language, gettext_for
 from backend.app.auth.schema import AccountStatusSchema, EmailRequestSchema
 from backend.app.api.services.user_auth import user_auth_service
 from backend.app.auth.utils import create_activation_token
@@ -13,57 +13,67 @@ logger = get_logger()
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _activation_errors(language: str) -> dict[str, tuple[int, dict]]:
+    """Map activation service errors to their responses in the given language."""
+
+    def t(message: str) -> str:
+        return gettext_for(language, message)
+
+    invalid_link = (
+        status.HTTP_400_BAD_REQUEST,
+        {
+            "status": "error",
+            "message": t(N_("Invalid activation link.")),
+            "action": t(N_("Please confirm that the link is correct.")),
+        },
+    )
+    return {
+        "Invalid token type": invalid_link,
+        "Activation token expired": (
+            status.HTTP_410_GONE,
+            {
+                "status": "error",
+                "message": t(N_("Activation link has expired.")),
+                "action": t(N_("Please request a new activation email.")),
+                "action_url": f"{settings.API_BASE_URL}{settings.API_V1_STR}/auth/resend-activation-link",
+                "email_required": True,
+            },
+        ),
+        "Invalid activation token": invalid_link,
+        "User already activated": (
+            status.HTTP_400_BAD_REQUEST,
+            {
+                "status": "error",
+                "message": t(N_("User already activated")),
+                "action": t(N_("You can log in with your credentials.")),
+            },
+        ),
+    }
+
+
+# Precomputed for every supported language so error responses need no gettext calls
+_ACTIVATION_ERRORS = {
+    language: _activation_errors(language) for language in settings.SUPPORTED_LANGUAGES
+}
+
+
 @router.get("/activate", status_code=status.HTTP_200_OK)
-async def activate_account(token: str, session: SessionDep):
+async def activate_account(token: str):
+    session = scoped_session()
     try:
-        user = await user_auth_service.activate_user_account(token, session)
-        return {"message": _("Account activated successfully."), "email": user.email}
+        email = await user_auth_service.activate_user_account(token, session)
+        return {"message": _("Account activated successfully."), "email": email}
     except ValueError as ve:
-        error_msg = str(ve)
-        if error_msg == "Invalid token type":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "status": "error",
-                    "message": _("Invalid activation link."),
-                    "action": _("Please confirm that the link is correct."),
-                },
-            )
-        elif error_msg == "Activation token expired":
-            raise HTTPException(
-                status_code=status.HTTP_410_GONE,
-                detail={
-                    "status": "error",
-                    "message": _("Activation link has expired."),
-                    "action": _("Please request a new activation email."),
-                    "action_url": f"{settings.API_BASE_URL}{settings.API_V1_STR}/auth/resend-activation-link",
-                    "email_required": True,
-                },
-            )
-        elif error_msg == "Invalid activation token":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "status": "error",
-                    "message": _("Invalid activation link."),
-                    "action": _("Please confirm that the link is correct."),
-                },
-            )
-        elif error_msg == "User already activated":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "status": "error",
-                    "message": _("User already activated"),
-                    "action": _("You can log in with your credentials."),
-                },
-            )
+        error = _ACTIVATION_ERRORS[get_current_language()].get(str(ve))
+        if error is not None:
+            status_code, detail = error
+            raise HTTPException(status_code=status_code, detail=detail)
 
     except HTTPException as http_exc:
-        logger.error(f"Activation error: {http_exc.detail}")
+        logger.error("Activation error: {}", http_exc.detail)
         raise http_exc
     except Exception as e:
-        logger.error(f"Failed to activate user account: {str(e)}")
+        logger.error("Failed to activate user account: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
@@ -89,7 +99,7 @@ async def resend_activation_link(email_data: EmailRequestSchema, session: Sessio
                     "action": _("Please check the email address and try again."),
                 },
             )
-        if user.is_active or user.account_status == AccountStatusSchema.ACTIVE:
+        if user.is_active or user.account_status is AccountStatusSchema.ACTIVE:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
@@ -107,10 +117,10 @@ async def resend_activation_link(email_data: EmailRequestSchema, session: Sessio
             "email": user.email,
         }
     except HTTPException as http_exc:
-        logger.error(f"Resend activation link error: {http_exc.detail}")
+        logger.error("Resend activation link error: {}", http_exc.detail)
         raise http_exc
     except Exception as e:
-        logger.error(f"Failed to resend activation email: {str(e)}")
+        logger.error("Failed to resend activation email: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
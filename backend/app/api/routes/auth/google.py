@@ -1,7 +1,12 @@
+import msgspec
 from fastapi import APIRouter, HTTPException, Request, Response, status
 
 from backend.app.api.services.oauth_service import oauth, oauth_service
-from backend.app.auth.schema import AccountStatusSchema
+from backend.app.auth.schema import (
+    AccountStatusSchema,
+    LoginResponseSchema,
+    UserPublicSchema,
+)
 from backend.app.auth.utils import create_jwt_token, set_auth_cookies
 from backend.app.core.config import settings
 from backend.app.core.db import SessionDep
@@ -13,6 +18,9 @@ logger = get_logger()
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 _CALLBACK_PATH = f"{settings.API_V1_STR}/auth/google/callback"
+_REFRESH_NAME = settings.COOKIE_REFRESH_NAME
+
+_encoder = msgspec.json.Encoder()
 
 
 @router.get("/google", summary="Redirect to Google OAuth consent screen")
@@ -23,19 +31,15 @@ async def google_login(request: Request):
 
 
 @router.get("/google/callback", summary="Handle Google OAuth callback")
-async def google_callback(
-    request: Request,
-    session: SessionDep,
-    response: Response,
-):
+async def google_callback(request: Request, session: SessionDep):
     """
     Exchange the authorisation code for tokens, resolve (or create) the user,
     and set JWT cookies — exactly as the OTP-based login flow does.
     """
     try:
-        token = await oauth.google.authorize_access_token(request)
+        token = await oauth_service.authorize_google_access_token(request)
     except Exception as e:
-        logger.error(f"Google OAuth token exchange failed: {e}")
+        logger.error("Google OAuth token exchange failed: {}", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
@@ -67,7 +71,7 @@ async def google_callback(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Google OAuth user resolution failed: {e}")
+        logger.error("Google OAuth user resolution failed: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
@@ -78,22 +82,19 @@ async def google_callback(
         )
 
     access_token = create_jwt_token(id=user.id)
-    refresh_token = create_jwt_token(id=user.id, type=settings.COOKIE_REFRESH_NAME)
-    set_auth_cookies(response, access_token, refresh_token)
+    refresh_token = create_jwt_token(id=user.id, type=_REFRESH_NAME)
 
-    return {
-        "message": _("Login successful."),
-        # kyc_required tells the frontend to redirect the user to the KYC
-        # screen to submit their national ID before they can use banking features.
-        "kyc_required": user.account_status == AccountStatusSchema.PENDING_KYC,
-        "user": {
-            "email": user.email,
-            "username": user.username,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "full_name": user.full_name,
-            "id_no": user.id_no,
-            "role": user.role,
-            "account_status": user.account_status,
-        },
-    }
+    response = Response(
+        content=_encoder.encode(
+            LoginResponseSchema(
+                message=_("Login successful."),
+                user=UserPublicSchema.from_user(user, include_status=True),
+                # kyc_required tells the frontend to redirect the user to the KYC
+                # screen to submit their national ID before they can use banking features.
+                kyc_required=user.account_status is AccountStatusSchema.PENDING_KYC,
+            )
+        ),
+        media_type="application/json",
+    )
+    set_auth_cookies(response, access_token, refresh_token)
+    return response
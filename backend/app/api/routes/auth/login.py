@@ -1,9 +1,19 @@
+import msgspec
 from fastapi import APIRouter, status, HTTPException, Response
 from backend.app.core.db import SessionDep
 from backend.app.core.i18n import _
-from backend.app.auth.utils import create_jwt_token, set_auth_cookies
+from backend.app.auth.utils import (
+    DUMMY_PASSWORD_HASH,
+    create_jwt_token,
+    set_auth_cookies,
+)
 from backend.app.core.config import settings
-from backend.app.auth.schema import LoginRequestSchema, OTPVerifyRequestSchema
+from backend.app.auth.schema import (
+    LoginRequestSchema,
+    LoginResponseSchema,
+    OTPVerifyRequestSchema,
+    UserPublicSchema,
+)
 from backend.app.api.services.user_auth import user_auth_service
 from backend.app.core.logging import get_logger
 
@@ -11,6 +21,12 @@ logger = get_logger()
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+_LOGIN_ATTEMPTS = settings.LOGIN_ATTEMPTS
+_LOCKOUT_MINUTES = settings.LOCKOUT_DURATION_MINUTES
+_REFRESH_NAME = settings.COOKIE_REFRESH_NAME
+
+_encoder = msgspec.json.Encoder()
+
 
 @router.post("/login/request-otp", status_code=status.HTTP_200_OK)
 async def request_login_otp(request_data: LoginRequestSchema, session: SessionDep):
@@ -19,7 +35,14 @@ async def request_login_otp(request_data: LoginRequestSchema, session: SessionDe
             email=request_data.email, session=session
         )
 
-        if user:
+        if not user:
+            # Spend the same hashing time as for a real account so the response
+            # time does not reveal whether the email is registered.
+            await user_auth_service.verify_user_password(
+                plain_password=request_data.password,
+                hashed_password=DUMMY_PASSWORD_HASH,
+            )
+        else:
             await user_auth_service.check_user_lockout(user, session)
 
             if not await user_auth_service.verify_user_password(
@@ -27,9 +50,7 @@ async def request_login_otp(request_data: LoginRequestSchema, session: SessionDe
                 hashed_password=user.hashed_password,
             ):
                 await user_auth_service.increment_failed_login_attempts(user, session)
-                remaining_attempts = (
-                    settings.LOGIN_ATTEMPTS - user.failed_login_attempts
-                )
+                remaining_attempts = _LOGIN_ATTEMPTS - user.failed_login_attempts
 
                 if remaining_attempts > 0:
                     error_message = _(
@@ -42,7 +63,7 @@ async def request_login_otp(request_data: LoginRequestSchema, session: SessionDe
                     error_message = _(
                         (
                             "Your account has been temporarily locked due to multiple failed login attempts"
-                            f"Please try again after {settings.LOCKOUT_DURATION_MINUTES} minutes."
+                            f"Please try again after {_LOCKOUT_MINUTES} minutes."
                         )
                     )
 
@@ -66,7 +87,10 @@ async def request_login_otp(request_data: LoginRequestSchema, session: SessionDe
                     },
                 )
 
-            await user_auth_service.reset_user_state(user, session)
+            # The reset is committed together with the new OTP in a single UPDATE
+            await user_auth_service.reset_user_state(
+                user, session, clear_otp=False, commit=False
+            )
             await user_auth_service.generate_and_save_otp(user, session)
 
         return {
@@ -78,7 +102,7 @@ async def request_login_otp(request_data: LoginRequestSchema, session: SessionDe
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
-        logger.error(f"Failed to process login otp request: {e}")
+        logger.error("Failed to process login otp request: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
@@ -90,37 +114,31 @@ async def request_login_otp(request_data: LoginRequestSchema, session: SessionDe
 
 
 @router.post("/login/verify-otp", status_code=status.HTTP_200_OK)
-async def verify_login_otp(
-    otp_data: OTPVerifyRequestSchema, session: SessionDep, response: Response
-):
+async def verify_login_otp(otp_data: OTPVerifyRequestSchema, session: SessionDep):
     try:
         user = await user_auth_service.verify_login_otp(
             otp_data.email, otp_data.otp, session
         )
 
-        await user_auth_service.reset_user_state(user, session)
-
         access_token = create_jwt_token(id=user.id)
-        refresh_token = create_jwt_token(id=user.id, type=settings.COOKIE_REFRESH_NAME)
-        set_auth_cookies(response, access_token, refresh_token)
+        refresh_token = create_jwt_token(id=user.id, type=_REFRESH_NAME)
 
-        return {
-            "message": _("Login successful."),
-            "user": {
-                "email": user.email,
-                "username": user.username,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "full_name": user.full_name,
-                "id_no": user.id_no,
-                "role": user.role,
-            },
-        }
+        response = Response(
+            content=_encoder.encode(
+                LoginResponseSchema(
+                    message=_("Login successful."),
+                    user=UserPublicSchema.from_user(user),
+                )
+            ),
+            media_type="application/json",
+        )
+        set_auth_cookies(response, access_token, refresh_token)
+        return response
 
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
-        logger.error(f"Failed to verify login otp request: {e}")
+        logger.error("Failed to verify login otp request: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
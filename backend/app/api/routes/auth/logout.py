@@ -15,7 +15,7 @@ async def logout(response: Response):
         logger.info("User logged out successfully.")
         return {"message": _("Logged out successfully.")}
     except Exception as e:
-        logger.error(f"Error during logout: {e}", e)
+        logger.error("Error during logout: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
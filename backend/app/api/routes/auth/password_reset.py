@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, status
 from backend.app.core.db import SessionDep
-from backend.app.core.i18n import _
+from backend.app.core.i18n import _, N_, get_current_language, gettext_for
 from backend.app.auth.schema import (
     ConfirmPasswordResetSchema,
     PasswordResetRequestSchema,
@@ -15,6 +15,42 @@ logger = get_logger()
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _reset_errors(language: str) -> dict[str, tuple[int, dict]]:
+    """Map password reset service errors to their responses in the given language."""
+
+    def t(message: str) -> str:
+        return gettext_for(language, message)
+
+    invalid_link = (
+        status.HTTP_400_BAD_REQUEST,
+        {
+            "status": "error",
+            "message": t(N_("Invalid password reset link.")),
+            "action": t(N_("Please confirm that the link is correct.")),
+        },
+    )
+    return {
+        "Password reset token expired": (
+            status.HTTP_410_GONE,
+            {
+                "status": "error",
+                "message": t(N_("Password reset link has expired.")),
+                "action": t(N_("Please request a new password reset email.")),
+                "action_url": f"{settings.API_BASE_URL}{settings.API_V1_STR}/auth/request-password-reset",
+                "email_required": True,
+            },
+        ),
+        "Invalid password reset token": invalid_link,
+        "Invalid token type": invalid_link,
+    }
+
+
+# Precomputed for every supported language so error responses need no gettext calls
+_RESET_ERRORS = {
+    language: _reset_errors(language) for language in settings.SUPPORTED_LANGUAGES
+}
+
+
 @router.post("/request-password-reset", status_code=status.HTTP_200_OK)
 async def request_password_reset(
     reset_data: PasswordResetRequestSchema,
@@ -34,7 +70,7 @@ async def request_password_reset(
             )
         }
     except Exception as e:
-        logger.error(f"Failed to process password reset request: {e}")
+        logger.error("Failed to process password reset request: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
@@ -55,41 +91,15 @@ async def reset_password(
         await user_auth_service.reset_password(token, reset_data.new_password, session)
         return {"message": _("Password has been reset successfully.")}
     except ValueError as ve:
-        error_msg = str(ve)
-        if error_msg == "Password reset token expired":
-            raise HTTPException(
-                status_code=status.HTTP_410_GONE,
-                detail={
-                    "status": "error",
-                    "message": _("Password reset link has expired."),
-                    "action": _("Please request a new password reset email."),
-                    "action_url": f"{settings.API_BASE_URL}{settings.API_V1_STR}/auth/request-password-reset",
-                    "email_required": True,
-                },
-            )
-        elif error_msg == "Invalid password reset token":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "status": "error",
-                    "message": _("Invalid password reset link."),
-                    "action": _("Please confirm that the link is correct."),
-                },
-            )
-        elif error_msg == "Invalid token type":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "status": "error",
-                    "message": _("Invalid password reset link."),
-                    "action": _("Please confirm that the link is correct."),
-                },
-            )
+        error = _RESET_ERRORS[get_current_language()].get(str(ve))
+        if error is not None:
+            status_code, detail = error
+            raise HTTPException(status_code=status_code, detail=detail)
     except HTTPException as http_exc:
-        logger.error(f"Password reset error: {http_exc.detail}")
+        logger.error("Password reset error: {}", http_exc.detail)
         raise http_exc
     except Exception as e:
-        logger.error(f"Failed to reset password: {e}")
+        logger.error("Failed to reset password: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
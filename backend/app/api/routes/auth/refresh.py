@@ -1,10 +1,12 @@
-import uuid
 import jwt
+import msgspec
 from fastapi import APIRouter, Response, status, Cookie, HTTPException
-from backend.app.core.db import SessionDep
+from backend.app.core.db import scoped_session
+from backend.app.auth.schema import LoginResponseSchema, UserPublicSchema
+from backend.app.auth.jwt_cache import verify_cached
 from backend.app.auth.utils import create_jwt_token, set_auth_cookies
 from backend.app.api.services.user_auth import user_auth_service
-from backend.app.core.i18n import _
+from backend.app.core.i18n import _, N_, get_current_language, gettext_for
 from backend.app.core.config import settings
 from backend.app.core.logging import get_logger
 
@@ -12,88 +14,97 @@ logger = get_logger()
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+_REFRESH_NAME = settings.COOKIE_REFRESH_NAME
+
+_encoder = msgspec.json.Encoder()
+
+
+def _refresh_errors(language: str) -> dict[str, dict]:
+    """Build the 401 error details of the refresh endpoint in the given language."""
+
+    def t(message: str) -> str:
+        return gettext_for(language, message)
+
+    def detail(message: str) -> dict:
+        return {
+            "status": "error",
+            "message": message,
+            "action": t(N_("Please log in again.")),
+        }
+
+    return {
+        "missing": detail(t(N_("No refresh token provided."))),
+        "expired": detail(t(N_("Refresh token has expired."))),
+        "invalid": detail(t(N_("Invalid refresh token."))),
+        "wrong_type": detail(t(N_("Invalid token type."))),
+        "user_not_found": detail(t(N_("User not found."))),
+    }
+
+
+# Precomputed for every supported language so error responses need no gettext calls
+_REFRESH_ERRORS = {
+    language: _refresh_errors(language) for language in settings.SUPPORTED_LANGUAGES
+}
+
 
 @router.post("/refresh", status_code=status.HTTP_200_OK)
 async def refresh_access_token(
-    response: Response,
-    session: SessionDep,
-    refresh_token: str | None = Cookie(None, alias=settings.COOKIE_REFRESH_NAME),
-) -> dict:
+    refresh_token: str | None = Cookie(None, alias=_REFRESH_NAME),
+) -> Response:
+    session = scoped_session()
+    errors = _REFRESH_ERRORS[get_current_language()]
     try:
         if not refresh_token:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "status": "error",
-                    "message": _("No refresh token provided."),
-                    "action": _("Please log in again."),
-                },
+                detail=errors["missing"],
             )
         try:
-            payload = jwt.decode(
-                refresh_token, settings.SIGNING_KEY, algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = await verify_cached(refresh_token)
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "status": "error",
-                    "message": _("Refresh token has expired."),
-                    "action": _("Please log in again."),
-                },
+                detail=errors["expired"],
             )
         except jwt.InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "status": "error",
-                    "message": _("Invalid refresh token."),
-                    "action": _("Please log in again."),
-                },
+                detail=errors["invalid"],
             )
-        if payload.get("type") != settings.COOKIE_REFRESH_NAME:
+        if payload.get("type") != _REFRESH_NAME:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "status": "error",
-                    "message": _("Invalid token type."),
-                    "action": _("Please log in again."),
-                },
+                detail=errors["wrong_type"],
             )
-        user_id = uuid.UUID(payload.get("id"))
+        user_id = payload.get("id")
         user = await user_auth_service.get_user_by_id(user_id, session)
         if not user:
-            logger.warning(f"User not found for ID: {user_id}")
+            logger.warning("User not found for ID: {}", user_id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "status": "error",
-                    "message": _("User not found."),
-                    "action": _("Please log in again."),
-                },
+                detail=errors["user_not_found"],
             )
         await user_auth_service.validate_user_status(user)
 
         new_access_token = create_jwt_token(id=user.id)
+
+        response = Response(
+            content=_encoder.encode(
+                LoginResponseSchema(
+                    message=_("Access token refreshed successfully."),
+                    user=UserPublicSchema.from_user(user),
+                )
+            ),
+            media_type="application/json",
+        )
         set_auth_cookies(response, new_access_token)
 
-        logger.info(f"Successfully refreshed access token for user ID: {user.email}")
-        return {
-            "message": _("Access token refreshed successfully."),
-            "user": {
-                "email": user.email,
-                "username": user.username,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "full_name": user.full_name,
-                "id_no": user.id_no,
-                "role": user.role,
-            },
-        }
+        logger.info("Successfully refreshed access token for user ID: {}", user.email)
+        return response
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
-        logger.error(f"Failed to refresh access token: {e}")
+        logger.error("Failed to refresh access token: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
@@ -26,8 +26,11 @@ async def register_user(
     Returns the created user details.
     """
     try:
-        # Check if the email is already registered
-        if await user_auth_service.check_user_email_exists(user_data.email, session):
+        # Check the email and ID number in a single round trip
+        email_taken, id_no_taken = await user_auth_service.check_email_or_idno_exists(
+            user_data.email, user_data.id_no, session
+        )
+        if email_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
@@ -36,7 +39,7 @@ async def register_user(
                     "action": _("Please register with different credentials."),
                 },
             )
-        if await user_auth_service.check_user_id_no_exists(user_data.id_no, session):
+        if id_no_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
@@ -48,7 +51,7 @@ async def register_user(
 
         new_user = await user_auth_service.create_user(user_data, session)
         logger.info(
-            f"New user {new_user.email} registered successfully awaiting acivation"
+            "New user {} registered successfully awaiting acivation", new_user.email
         )
         return new_user
 
@@ -57,7 +60,7 @@ async def register_user(
         raise http_exc
     except IntegrityError as e:
         await session.rollback()
-        logger.warning(f"Registration integrity error: {e}")
+        logger.warning("Registration integrity error: {}", e)
         if "id_no" in str(e.orig):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -79,7 +82,7 @@ async def register_user(
         )
     except Exception as e:
         await session.rollback()
-        logger.error(f"Error during user registration: {str(e)}")
+        logger.error("Error during user registration: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"status": "error", "message": _("Internal server error.")},
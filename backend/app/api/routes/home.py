@@ -1,12 +1,26 @@
-from fastapi import APIRouter
+import msgspec
+from fastapi import APIRouter, Response
+from backend.app.core.config import settings
 from backend.app.core.logging import get_logger
-from backend.app.core.i18n import _
+from backend.app.core.i18n import N_, get_current_language, gettext_for
 
 logger = get_logger()
 
 router = APIRouter(prefix="/home", tags=["home"])
 
+_WELCOME_MESSAGE = N_("Welcome to the Next-Gen Backend API!")
+
+# Encoded once per supported language. A fresh Response is still built per
+# request because middleware appends headers to the response's header list.
+_HOME_BODIES = {
+    language: msgspec.json.encode({"message": gettext_for(language, _WELCOME_MESSAGE)})
+    for language in settings.SUPPORTED_LANGUAGES
+}
+
 
 @router.get("/")
-async def home():
-    return {"message": _("Welcome to the Next-Gen Backend API!")}
+async def home() -> Response:
+    return Response(
+        content=_HOME_BODIES[get_current_language()],
+        media_type="application/json",
+    )
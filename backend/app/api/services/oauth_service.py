@@ -1,6 +1,10 @@
+import asyncio
 import uuid
 
-from fastapi import HTTPException, status
+from fastapi import Request
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -9,13 +13,21 @@ from authlib.integrations.starlette_client import OAuth
 from backend.app.auth.models import User
 from backend.app.auth.oauth.models import UserProvider
 from backend.app.auth.schema import AccountStatusSchema, SecurityQuestionSchema
-from backend.app.auth.utils import generate_password_hash, generate_username
+from backend.app.auth.utils import OAUTH_PASSWORD_HASH, generate_username
 from backend.app.core.config import settings
-from backend.app.core.i18n import _
+from backend.app.core.redis_client import redis_client
 from backend.app.core.logging import get_logger
 
 logger = get_logger()
 
+# Generated usernames are random; a collision with the unique constraint is
+# retried with a fresh one instead of checking availability up front
+_USERNAME_ATTEMPTS = 3
+
+# (provider, provider_id) -> user id bindings never change once created, so they
+# are cached to skip the provider lookup on repeat logins
+_PROVIDER_CACHE_TTL_SECONDS = 1800
+
 # ---------------------------------------------------------------------------
 # Authlib OAuth client — single application-wide instance
 # ---------------------------------------------------------------------------
@@ -29,6 +41,14 @@ oauth.register(
     client_kwargs={"scope": "openid email profile"},
 )
 
+# Built once with bound parameters and reused on every lookup
+_USER_BY_PROVIDER = (
+    select(User)
+    .join(UserProvider, UserProvider.user_uid == User.id)
+    .where(UserProvider.provider == bindparam("provider"))
+    .where(UserProvider.provider_id == bindparam("provider_id"))
+)
+
 
 # ---------------------------------------------------------------------------
 # Service
@@ -36,23 +56,46 @@ oauth.register(
 
 
 class OAuthService:
+    def __init__(self) -> None:
+        # Token exchanges currently running, keyed by (code, state)
+        self._token_exchanges: dict[tuple[str, str], asyncio.Task] = {}
+
     # ------------------------------------------------------------------
-    # Provider record helpers
+    # Token exchange
     # ------------------------------------------------------------------
 
-    async def get_provider_record(
-        self,
-        provider: str,
-        provider_id: str,
-        session: AsyncSession,
-    ) -> UserProvider | None:
-        """Return the UserProvider row that maps (provider, provider_id) to a user."""
-        result = await session.exec(
-            select(UserProvider)
-            .where(UserProvider.provider == provider)
-            .where(UserProvider.provider_id == str(provider_id))
-        )
-        return result.first()
+    async def authorize_google_access_token(self, request: Request) -> dict:
+        """
+        Exchange the authorisation code of a Google callback for tokens.
+
+        Duplicate callbacks for the same code (double clicks, mobile retries)
+        arriving while the first exchange is still running await that exchange
+        instead of calling Google's token endpoint again. A duplicate is only
+        joined when its own session holds the OAuth state of the request, so a
+        leaked code cannot be used to obtain someone else's tokens.
+        """
+        code = request.query_params.get("code")
+        state = request.query_params.get("state")
+        if not code or not state:
+            return await oauth.google.authorize_access_token(request)
+
+        key = (code, state)
+        exchange = self._token_exchanges.get(key)
+        if exchange is not None:
+            if await oauth.google.framework.get_state_data(request.session, state):
+                return await asyncio.shield(exchange)
+            return await oauth.google.authorize_access_token(request)
+
+        exchange = asyncio.ensure_future(oauth.google.authorize_access_token(request))
+        self._token_exchanges[key] = exchange
+        exchange.add_done_callback(lambda _: self._token_exchanges.pop(key, None))
+        # Shielded so a disconnecting first caller does not cancel the exchange
+        # for the duplicates waiting on it
+        return await asyncio.shield(exchange)
+
+    # ------------------------------------------------------------------
+    # Provider record helpers
+    # ------------------------------------------------------------------
 
     async def link_provider(
         self,
@@ -60,39 +103,72 @@ class OAuthService:
         provider: str,
         provider_id: str,
         session: AsyncSession,
-    ) -> UserProvider:
-        """Create a new UserProvider record linking a user to an OAuth provider."""
-        record = UserProvider(
-            user_uid=user_uid,
-            provider=provider,
-            provider_id=str(provider_id),
+        commit: bool = True,
+    ) -> uuid.UUID | None:
+        """
+        Link a user to an OAuth provider account.
+
+        Idempotent: when a concurrent login already created the binding the
+        insert is skipped and None is returned instead of the new row's uid.
+        With ``commit=False`` the caller commits and caches the binding.
+        """
+        result = await session.exec(
+            pg_insert(UserProvider)
+            .values(user_uid=user_uid, provider=provider, provider_id=str(provider_id))
+            .on_conflict_do_nothing(constraint="uq_user_providers_provider_provider_id")
+            .returning(UserProvider.uid)
         )
-        session.add(record)
-        await session.commit()
-        await session.refresh(record)
+        uid = result.scalar_one_or_none()
+        if commit:
+            await session.commit()
+        if uid is None:
+            logger.info(
+                "Provider '{}' (id={}) was already linked, skipping",
+                provider,
+                provider_id,
+            )
+            return None
+        if commit:
+            await self._cache_provider_user_id(provider, provider_id, user_uid)
         logger.info(
-            f"Linked provider '{provider}' (id={provider_id}) to user {user_uid}"
+            "Linked provider '{}' (id={}) to user {}", provider, provider_id, user_uid
         )
-        return record
+        return uid
+
+    async def _get_cached_provider_user_id(
+        self, provider: str, provider_id: str
+    ) -> str | None:
+        try:
+            return await redis_client.get(f"oauth:{provider}:{provider_id}")
+        except Exception as e:
+            # The cache is an optimisation only; fall back to the database
+            logger.warning("OAuth provider cache read failed: {}", e)
+            return None
 
-    async def get_user_by_provider_uid(
+    async def _cache_provider_user_id(
+        self, provider: str, provider_id: str, user_uid: uuid.UUID
+    ) -> None:
+        try:
+            await redis_client.set(
+                f"oauth:{provider}:{provider_id}",
+                str(user_uid),
+                ex=_PROVIDER_CACHE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.warning("OAuth provider cache write failed: {}", e)
+
+    async def get_user_by_provider(
         self,
-        record: UserProvider,
+        provider: str,
+        provider_id: str,
         session: AsyncSession,
-    ) -> User:
-        """Resolve the User that owns a given UserProvider record."""
-        result = await session.exec(select(User).where(User.id == record.user_uid))
-        user = result.first()
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={
-                    "status": "error",
-                    "message": _("Associated user account not found."),
-                    "action": _("Please contact support."),
-                },
-            )
-        return user
+    ) -> User | None:
+        """Return the User linked to (provider, provider_id) in a single query."""
+        result = await session.exec(
+            _USER_BY_PROVIDER,
+            params={"provider": provider, "provider_id": str(provider_id)},
+        )
+        return result.first()
 
     # ------------------------------------------------------------------
     # OAuth user creation
@@ -102,6 +178,7 @@ class OAuthService:
         self,
         google_info: dict,
         session: AsyncSession,
+        commit: bool = True,
     ) -> User:
         """
         Create a brand-new User from Google userinfo payload.
@@ -115,16 +192,15 @@ class OAuthService:
         first_name: str = (google_info.get("given_name") or email.split("@")[0])[:30]
         last_name: str = (google_info.get("family_name") or "User")[:30]
 
-        # A random hash the user can never reproduce — locks out password login
-        dummy_hash = generate_password_hash(uuid.uuid4().hex)
-
         user = User(
             email=email,
             first_name=first_name,
             last_name=last_name,
             # id_no intentionally omitted — national ID is collected during KYC.
             # Generating a random placeholder would be fraudulent in a banking context.
-            hashed_password=dummy_hash,
+            # Unusable sentinel instead of hashing a random secret — locks out
+            # password login without spending Argon2 time on sign-up
+            hashed_password=OAUTH_PASSWORD_HASH,
             username=generate_username(),
             is_active=True,
             account_status=AccountStatusSchema.PENDING_KYC,
@@ -132,10 +208,19 @@ class OAuthService:
             security_question=SecurityQuestionSchema.FAVORITE_COLOR,
             security_answer="oauth_placeholder",
         )
-        session.add(user)
-        await session.commit()
-        await session.refresh(user)
-        logger.info(f"Created new OAuth user (pending KYC): {user.email}")
+        for attempt in range(_USERNAME_ATTEMPTS):
+            try:
+                async with session.begin_nested():
+                    session.add(user)
+                break
+            except IntegrityError as e:
+                if "username" not in str(e.orig) or attempt == _USERNAME_ATTEMPTS - 1:
+                    raise
+                logger.warning("Generated username {} already taken", user.username)
+                user.username = generate_username()
+        if commit:
+            await session.commit()
+        logger.info("Created new OAuth user (pending KYC): {}", user.email)
         return user
 
     # ------------------------------------------------------------------
@@ -163,11 +248,21 @@ class OAuthService:
         provider_id: str = str(google_info["sub"])
         email: str = google_info["email"]
 
-        # ① Check for an existing provider binding
-        record = await self.get_provider_record(provider, provider_id, session)
-        if record is not None:
-            user = await self.get_user_by_provider_uid(record, session)
-            logger.info(f"OAuth login for existing user: {user.email}")
+        # ① Check for an existing provider binding, cached or in the database
+        cached_user_id = await self._get_cached_provider_user_id(provider, provider_id)
+        if cached_user_id is not None:
+            user = await user_auth_service.get_user_by_id(
+                cached_user_id, session, include_inactive=True
+            )
+            if user is not None:
+                logger.info("OAuth login for existing user: {}", user.email)
+                return user
+
+        # user_uid cascades on delete, so a binding always has its user
+        user = await self.get_user_by_provider(provider, provider_id, session)
+        if user is not None:
+            await self._cache_provider_user_id(provider, provider_id, user.id)
+            logger.info("OAuth login for existing user: {}", user.email)
             return user
 
         # ② Check for an existing user with the same email (account linking).
@@ -177,12 +272,17 @@ class OAuthService:
         )
         if user is not None:
             await self.link_provider(user.id, provider, provider_id, session)
-            logger.info(f"Linked Google account to existing user: {user.email}")
+            logger.info("Linked Google account to existing user: {}", user.email)
             return user
 
-        # ③ Brand-new user
-        user = await self.create_oauth_user(google_info, session)
-        await self.link_provider(user.id, provider, provider_id, session)
+        # ③ Brand-new user: user and binding are written in one transaction
+        user = await self.create_oauth_user(google_info, session, commit=False)
+        linked = await self.link_provider(
+            user.id, provider, provider_id, session, commit=False
+        )
+        await session.commit()
+        if linked is not None:
+            await self._cache_provider_user_id(provider, provider_id, user.id)
         return user
 
 
@@ -1,16 +1,21 @@
 import asyncio
+import hmac
 import jwt
 import uuid
+from typing import NoReturn
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status
-from sqlmodel import select
+from sqlalchemy import Row, bindparam, case, literal, update
+from sqlmodel import or_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from backend.app.auth.models import User
 from backend.app.auth.schema import AccountStatusSchema, UserCreateSchema
+from backend.app.auth.jwt_cache import decode_link_token
 from backend.app.auth.utils import (
     generate_username,
     generate_password_hash,
     verify_password_hash,
+    run_in_kdf_pool,
     create_activation_token,
     generate_otp,
 )
@@ -18,58 +23,112 @@ from backend.app.core.services.activation_email import send_activation_email
 from backend.app.core.services.login_otp import send_login_otp_email
 from backend.app.core.services.account_lockout import send_account_lockout_email
 from backend.app.core.config import settings
+from backend.app.core.db import async_session_factory
 from backend.app.core.i18n import _
 from backend.app.core.logging import get_logger
 
 logger = get_logger()
 
+# Strong references to fire-and-forget tasks so they are not garbage collected
+# before they finish
+_background_tasks: set[asyncio.Task] = set()
+
+# Lookup statements are built once with bound parameters and reused, so each
+# call skips statement construction and cache-key generation. Keyed by
+# include_inactive.
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_USERS_BY_EMAIL = {True: _USER_BY_EMAIL, False: _USER_BY_EMAIL.where(User.is_active)}
+_USER_BY_ID_NO = select(User).where(User.id_no == bindparam("id_no"))
+_USERS_BY_ID_NO = {True: _USER_BY_ID_NO, False: _USER_BY_ID_NO.where(User.is_active)}
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_USERS_BY_ID = {True: _USER_BY_ID, False: _USER_BY_ID.where(User.is_active)}
+# The registration uniqueness probe fetches only the two columns it compares
+_ACTIVE_EMAIL_OR_ID_NO = (
+    select(User.email, User.id_no)
+    .where(User.is_active)
+    .where(or_(User.email == bindparam("email"), User.id_no == bindparam("id_no")))
+    .limit(2)
+)
+# Only the columns OTP verification reads, so the common path skips loading
+# and validating a full User
+_LOGIN_SLICE_BY_EMAIL = select(
+    User.id,
+    User.hashed_password,
+    User.is_active,
+    User.account_status,
+    User.failed_login_attempts,
+    User.last_failed_login,
+    User.otp,
+    User.otp_expiary_time,
+).where(User.email == bindparam("email"), User.is_active)
+# Consumes the OTP and resets the login counters as reset_user_state would;
+# matching on the OTP keeps it single-use under concurrent verifications
+_CONSUME_LOGIN_OTP = (
+    update(User)
+    .where(User.id == bindparam("user_id"), User.otp == bindparam("login_otp"))
+    .values(
+        failed_login_attempts=0,
+        last_failed_login=None,
+        otp="",
+        otp_expiary_time=None,
+    )
+    .returning(User)
+)
+
 
 class UserAuthService:
     async def get_user_by_email(
         self, email: str, session: AsyncSession, include_inactive: bool = False
     ) -> User | None:
-        statement = select(User).where(User.email == email)
-
-        if not include_inactive:
-            statement = statement.where(User.is_active)
-        result = await session.exec(statement)
-        user = result.first()
-        return user
+        result = await session.exec(
+            _USERS_BY_EMAIL[include_inactive], params={"email": email}
+        )
+        return result.first()
 
     async def get_user_by_id_no(
         self, id_no: int, session: AsyncSession, include_inactive: bool = False
     ) -> User | None:
-        statement = select(User).where(User.id_no == id_no)
-
-        if not include_inactive:
-            statement = statement.where(User.is_active)
-        result = await session.exec(statement)
-        user = result.first()
-        return user
+        result = await session.exec(
+            _USERS_BY_ID_NO[include_inactive], params={"id_no": id_no}
+        )
+        return result.first()
 
     async def get_user_by_id(
-        self, user_id: uuid.UUID, session: AsyncSession, include_inactive: bool = False
+        self,
+        user_id: uuid.UUID | str,
+        session: AsyncSession,
+        include_inactive: bool = False,
     ) -> User | None:
-        statement = select(User).where(User.id == user_id)
-
-        if not include_inactive:
-            statement = statement.where(User.is_active)
-        result = await session.exec(statement)
-        user = result.first()
-        return user
-
-    async def check_user_email_exists(self, email: str, session: AsyncSession) -> bool:
-        user = await self.get_user_by_email(email=email, session=session)
-        return bool(user)
-
-    async def check_user_id_no_exists(self, id_no: int, session: AsyncSession) -> bool:
-        user = await self.get_user_by_id_no(id_no=id_no, session=session)
-        return bool(user)
+        # asyncpg encodes UUID strings natively, so callers holding the id as a
+        # string (e.g. a JWT claim) do not need to parse it first.
+        result = await session.exec(
+            _USERS_BY_ID[include_inactive], params={"user_id": user_id}
+        )
+        return result.first()
+
+    async def get_login_slice(self, email: str, session: AsyncSession) -> Row | None:
+        # (id, hashed_password, is_active, account_status, failed_login_attempts,
+        # last_failed_login, otp, otp_expiary_time) of an active user
+        result = await session.exec(_LOGIN_SLICE_BY_EMAIL, params={"email": email})
+        return result.first()
+
+    async def check_email_or_idno_exists(
+        self, email: str, id_no: int, session: AsyncSession
+    ) -> tuple[bool, bool]:
+        result = await session.exec(
+            _ACTIVE_EMAIL_OR_ID_NO, params={"email": email, "id_no": id_no}
+        )
+        rows = result.all()
+        email_taken = any(row.email == email for row in rows)
+        id_no_taken = any(row.id_no == id_no for row in rows)
+        return email_taken, id_no_taken
 
     async def verify_user_password(
         self, plain_password: str, hashed_password: str
     ) -> bool:
-        return verify_password_hash(plain_password, hashed_password)
+        return await run_in_kdf_pool(
+            verify_password_hash, plain_password, hashed_password
+        )
 
     async def reset_user_state(
         self,
@@ -78,6 +137,7 @@ class UserAuthService:
         *,
         clear_otp: bool = True,
         log_action: bool = True,
+        commit: bool = True,
     ) -> None:
         previous_status = user.account_status
         user.failed_login_attempts = 0
@@ -87,18 +147,21 @@ class UserAuthService:
             user.otp = ""
             user.otp_expiary_time = None
 
-        if previous_status == AccountStatusSchema.LOCKED:
+        if previous_status is AccountStatusSchema.LOCKED:
             user.account_status = AccountStatusSchema.ACTIVE
 
-        await session.commit()
-        await session.refresh(user)
+        if commit:
+            await session.commit()
 
         if log_action and previous_status != user.account_status:
             logger.info(
-                f"User {user.email} account status changed from {previous_status} to {user.account_status}"
+                "User {} account status changed from {} to {}",
+                user.email,
+                previous_status,
+                user.account_status,
             )
 
-    async def validate_user_status(self, user: User) -> None:
+    async def validate_user_status(self, user: User | Row) -> None:
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -110,7 +173,7 @@ class UserAuthService:
                     ),
                 },
             )
-        if user.account_status == AccountStatusSchema.LOCKED:
+        if user.account_status is AccountStatusSchema.LOCKED:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail={
@@ -121,7 +184,7 @@ class UserAuthService:
                     ),
                 },
             )
-        if user.account_status == AccountStatusSchema.INACTIVE:
+        if user.account_status is AccountStatusSchema.INACTIVE:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
@@ -142,38 +205,54 @@ class UserAuthService:
             )
 
             await session.commit()
-            await session.refresh(user)
-
-            for attempt in range(3):
-                try:
-                    await send_login_otp_email(email=user.email, otp=otp)
-                    logger.info(f"OTP generated and sent to {user.email}")
-                    return True, otp
-                except Exception as e:
-                    logger.error(f"Failed to send OTP email to {user.email}: {e}")
-                    if attempt < 2:
-                        logger.info(
-                            f"Retrying to send OTP email to {user.email} (Attempt {attempt + 2}/3)"
-                        )
-                    else:
-                        user.otp = ""
-                        user.otp_expiary_time = None
-                        await session.commit()
-                        await session.refresh(user)
-                        logger.error(
-                            f"All attempts to send OTP email to {user.email} have failed."
-                        )
-                        return False, ""
-                    await asyncio.sleep(2**attempt)
-            return False, ""
+
+            # Delivery and its retries run after the response has been sent
+            task = asyncio.create_task(
+                self._send_otp_with_retry(user.id, user.email, otp)
+            )
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            return True, otp
 
         except Exception as e:
-            logger.error(f"Failed to generate and save OTP: {e}")
+            logger.error("Failed to generate and save OTP: {}", e)
             return (
                 False,
                 "An error occurred while generating OTP. Please try again later.",
             )
 
+    async def _send_otp_with_retry(
+        self, user_id: uuid.UUID, email: str, otp: str
+    ) -> None:
+        for attempt in range(3):
+            try:
+                await send_login_otp_email(email=email, otp=otp)
+                logger.info("OTP generated and sent to {}", email)
+                return
+            except Exception as e:
+                logger.error("Failed to send OTP email to {}: {}", email, e)
+                if attempt < 2:
+                    logger.info(
+                        "Retrying to send OTP email to {} (Attempt {}/3)",
+                        email,
+                        attempt + 2,
+                    )
+                    await asyncio.sleep(2**attempt)
+
+        logger.error("All attempts to send OTP email to {} have failed.", email)
+        # The request session is gone by now; invalidate the undelivered OTP in
+        # a fresh one, unless a newer OTP has replaced it in the meantime
+        try:
+            async with async_session_factory() as session:
+                await session.exec(
+                    update(User)
+                    .where(User.id == user_id, User.otp == otp)
+                    .values(otp="", otp_expiary_time=None)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error("Failed to invalidate undelivered OTP for {}: {}", email, e)
+
     async def create_user(
         self, user_data: UserCreateSchema, session: AsyncSession
     ) -> User:
@@ -187,7 +266,9 @@ class UserAuthService:
         )
 
         password = user_data_dict.pop("password")
-        user_data_dict["hashed_password"] = generate_password_hash(password)
+        user_data_dict["hashed_password"] = await run_in_kdf_pool(
+            generate_password_hash, password
+        )
         user_data_dict["username"] = generate_username()
 
         new_user = User(
@@ -198,50 +279,57 @@ class UserAuthService:
 
         session.add(new_user)
         await session.commit()
-        await session.refresh(new_user)
 
         activation_token = create_activation_token(new_user.id)
         try:
             await send_activation_email(email=new_user.email, token=activation_token)
-            logger.info(f"Activation email sent to {new_user.email}")
+            logger.info("Activation email sent to {}", new_user.email)
         except Exception as e:
-            logger.error(f"Failed to send activation email to {new_user.email}: {e}")
+            logger.error("Failed to send activation email to {}: {}", new_user.email, e)
             raise
 
         return new_user
 
-    async def activate_user_account(self, token: str, session: AsyncSession) -> User:
+    async def activate_user_account(self, token: str, session: AsyncSession) -> str:
         try:
-            payload = jwt.decode(
-                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = decode_link_token(token)
             if payload.get("type") != "activation":
                 raise ValueError("Invalid token type")
 
             user_id = uuid.UUID(payload.get("id"))
 
-            user = await self.get_user_by_id(
-                user_id=user_id, session=session, include_inactive=True
-            )
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail={
-                        "status": "error",
-                        "message": _("User not found"),
-                    },
+            # Activate and reset the login state in one statement; the row is
+            # only read back separately when nothing was updated.
+            statement = (
+                update(User)
+                .where(User.id == user_id, User.is_active.is_(False))
+                .values(
+                    is_active=True,
+                    account_status=AccountStatusSchema.ACTIVE,
+                    failed_login_attempts=0,
+                    last_failed_login=None,
+                    otp="",
+                    otp_expiary_time=None,
                 )
-            if user.is_active:
-                raise ValueError("User already activated")
-            await self.reset_user_state(
-                user=user, session=session, clear_otp=True, log_action=True
+                .returning(User.email)
             )
-            user.is_active = True
-            user.account_status = AccountStatusSchema.ACTIVE
+            result = await session.exec(statement)
+            email = result.scalar_one_or_none()
+            if email is None:
+                existing = await session.exec(select(User.id).where(User.id == user_id))
+                if existing.first() is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail={
+                            "status": "error",
+                            "message": _("User not found"),
+                        },
+                    )
+                raise ValueError("User already activated")
             await session.commit()
-            await session.refresh(user)
 
-            return user
+            logger.info("User {} account activated", email)
+            return email
         except jwt.ExpiredSignatureError:
             raise ValueError("Activation token expired")
         except jwt.InvalidTokenError:
@@ -249,15 +337,15 @@ class UserAuthService:
         except HTTPException as http_exc:
             raise http_exc
         except Exception as e:
-            logger.error(f"Failed to activate user account: {e}")
+            logger.error("Failed to activate user account: {}", e)
             raise
 
     async def verify_login_otp(
         self, email: str, otp: str, session: AsyncSession
     ) -> User:
         try:
-            user = await self.get_user_by_email(email=email, session=session)
-            if not user:
+            login = await self.get_login_slice(email, session)
+            if login is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail={
@@ -265,22 +353,17 @@ class UserAuthService:
                         "message": _("Invalid credentials"),
                     },
                 )
-            await self.validate_user_status(user)
+            # Locked accounts are rejected here, so there is no lockout to lift
+            await self.validate_user_status(login)
 
-            await self.check_user_lockout(user, session)
-
-            if not user.otp or user.otp != otp:
-                await self.increment_failed_login_attempts(user, session)
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={
-                        "status": "error",
-                        "message": _("Invalid OTP"),
-                        "action": _("Please check your OTP and try again."),
-                    },
-                )
+            # Constant-time comparison so response timing does not leak how
+            # many leading digits of a guess were right
+            if not login.otp or not hmac.compare_digest(
+                login.otp.encode(), otp.encode()
+            ):
+                await self._reject_login_otp(login.id, session)
 
-            if not user.otp_expiary_time or user.otp_expiary_time < datetime.now(
+            if not login.otp_expiary_time or login.otp_expiary_time < datetime.now(
                 timezone.utc
             ):
                 raise HTTPException(
@@ -292,14 +375,23 @@ class UserAuthService:
                     },
                 )
 
-            await self.reset_user_state(user, session, clear_otp=False)
+            # The OTP is single-use: clear it together with the login counters.
+            # The full row is only loaded here, from the UPDATE itself.
+            result = await session.exec(
+                _CONSUME_LOGIN_OTP, params={"user_id": login.id, "login_otp": login.otp}
+            )
+            user = result.scalar_one_or_none()
+            if user is None:
+                # Consumed by a concurrent verification in the meantime
+                await self._reject_login_otp(login.id, session)
+            await session.commit()
 
             return user
 
         except HTTPException as http_exc:
             raise http_exc
         except Exception as e:
-            logger.error(f"Failed to verify login OTP: {e}")
+            logger.error("Failed to verify login OTP: {}", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail={
@@ -309,8 +401,24 @@ class UserAuthService:
                 },
             )
 
+    async def _reject_login_otp(
+        self, user_id: uuid.UUID, session: AsyncSession
+    ) -> NoReturn:
+        # Counting the failure needs the full row, so it is loaded only now
+        user = await self.get_user_by_id(user_id, session)
+        if user is not None:
+            await self.increment_failed_login_attempts(user, session)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "status": "error",
+                "message": _("Invalid OTP"),
+                "action": _("Please check your OTP and try again."),
+            },
+        )
+
     async def check_user_lockout(self, user: User, session: AsyncSession) -> None:
-        if user.account_status != AccountStatusSchema.LOCKED:
+        if user.account_status is not AccountStatusSchema.LOCKED:
             return
 
         if user.last_failed_login is None:
@@ -324,11 +432,11 @@ class UserAuthService:
 
         if current_time >= lockout_time:
             await self.reset_user_state(user, session, clear_otp=False)
-            logger.info(f"Lockout period ended for user {user.email}")
+            logger.info("Lockout period ended for user {}", user.email)
             return
 
         remaining_minutes = int((lockout_time - current_time).total_seconds() / 60)
-        logger.warning(f"Attempted login for a locked account: {user.email}")
+        logger.warning("Attempted login for a locked account: {}", user.email)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
@@ -354,34 +462,58 @@ class UserAuthService:
                 await send_account_lockout_email(
                     email=user.email, lockout_time=datetime.now(timezone.utc)
                 )
-                logger.info(f"Account lockout email sent to {user.email}")
+                logger.info("Account lockout email sent to {}", user.email)
             except Exception as e:
                 logger.error(
-                    f"Failed to send account lockout email to {user.email}: {e}"
+                    "Failed to send account lockout email to {}: {}", user.email, e
                 )
                 raise
             logger.warning(
-                f"User {user.email} account locked due to too many failed login attempts."
+                "User {} account locked due to too many failed login attempts.",
+                user.email,
             )
         await session.commit()
-        await session.refresh(user)
 
     async def reset_password(
         self, token: str, new_password: str, session: AsyncSession
     ) -> None:
         try:
-            payload = jwt.decode(
-                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = decode_link_token(token)
             if payload.get("type") != "password_reset":
                 raise ValueError("Invalid token type")
 
             user_id = uuid.UUID(payload.get("id"))
+            hashed_password = await run_in_kdf_pool(
+                generate_password_hash, new_password
+            )
 
-            user = await self.get_user_by_id(
-                user_id=user_id, session=session, include_inactive=True
+            # Store the new hash and reset the login state in one statement,
+            # unlocking the account as reset_user_state would.
+            statement = (
+                update(User)
+                .where(User.id == user_id)
+                .values(
+                    hashed_password=hashed_password,
+                    failed_login_attempts=0,
+                    last_failed_login=None,
+                    otp="",
+                    otp_expiary_time=None,
+                    account_status=case(
+                        (
+                            User.account_status == AccountStatusSchema.LOCKED,
+                            # Typed so the enum is bound by name like the column
+                            literal(
+                                AccountStatusSchema.ACTIVE, User.account_status.type
+                            ),
+                        ),
+                        else_=User.account_status,
+                    ),
+                )
+                .returning(User.email)
             )
-            if not user:
+            result = await session.exec(statement)
+            email = result.scalar_one_or_none()
+            if email is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail={
@@ -389,17 +521,14 @@ class UserAuthService:
                         "message": _("User not found"),
                     },
                 )
-            user.hashed_password = generate_password_hash(new_password)
-            await self.reset_user_state(user, session, clear_otp=True, log_action=True)
             await session.commit()
-            await session.refresh(user)
-            logger.info(f"Password reset successful for user {user.email}")
+            logger.info("Password reset successful for user {}", email)
         except jwt.ExpiredSignatureError:
             raise ValueError("Password reset token expired")
         except jwt.InvalidTokenError:
             raise ValueError("Invalid password reset token")
         except Exception as e:
-            logger.error(f"Failed to reset password: {e}")
+            logger.error("Failed to reset password: {}", e)
             raise
 
 
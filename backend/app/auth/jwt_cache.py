@@ -0,0 +1,86 @@
+import hashlib
+import time
+from types import MappingProxyType
+
+import jwt
+import msgspec
+from cachetools import TLRUCache
+from jwt.exceptions import DecodeError
+
+from backend.app.core.config import settings
+
+# Upper bound on how long a verified payload is trusted without re-checking the
+# signature. Entries also never outlive the token's own ``exp`` claim.
+_MAX_TTL_SECONDS = 30
+
+_ALGORITHMS = [settings.JWT_ALGORITHM]
+# Parsed once so verification does not re-prepare the key material per token
+_VERIFY_KEY = jwt.get_algorithm_by_name(settings.JWT_ALGORITHM).prepare_key(
+    settings.SIGNING_KEY
+)
+_DECODE_OPTIONS = {"require": ["exp", "type", "id"]}
+# Activation and password reset links are signed with a separate secret
+_LINK_VERIFY_KEY = jwt.get_algorithm_by_name(settings.JWT_ALGORITHM).prepare_key(
+    settings.JWT_SECRET_KEY
+)
+
+
+class _MsgspecJWT(jwt.PyJWT):
+    """PyJWT with the claims segment parsed by msgspec instead of the json module."""
+
+    # _decode_payload is a private PyJWT hook; pyproject.toml, requirements.txt
+    # and uv.lock pin PyJWT to exactly 2.10.1, so review this override on upgrade
+    _payload_decoder = msgspec.json.Decoder(dict)
+
+    def _decode_payload(self, decoded: dict) -> dict:
+        try:
+            return self._payload_decoder.decode(decoded["payload"])
+        except msgspec.ValidationError as e:
+            raise DecodeError("Invalid payload string: must be a json object") from e
+        except msgspec.DecodeError as e:
+            raise DecodeError(f"Invalid payload string: {e}") from e
+
+
+_jwt = _MsgspecJWT()
+
+
+def _time_to_use(key: bytes, payload: dict, now: float) -> float:
+    return min(now + _MAX_TTL_SECONDS, payload["exp"])
+
+
+# Keyed by the SHA-256 digest of the token so raw tokens are never kept in memory.
+# All cache access is synchronous, so it is atomic with respect to the event loop.
+_verified_tokens: TLRUCache = TLRUCache(
+    maxsize=10_000, ttu=_time_to_use, timer=time.time
+)
+
+
+async def verify_cached(token: str) -> MappingProxyType:
+    """
+    Decode and verify a JWT signed with the signing key, reusing the payload of
+    a recent successful verification of the same token.
+
+    The payload is shared between callers, so it is returned read-only.
+    Raises the usual ``jwt.InvalidTokenError`` subclasses on failure; failures
+    are never cached.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _verified_tokens.get(key)
+    if payload is not None:
+        return payload
+
+    payload = MappingProxyType(
+        _jwt.decode(token, _VERIFY_KEY, algorithms=_ALGORITHMS, options=_DECODE_OPTIONS)
+    )
+    _verified_tokens[key] = payload
+    return payload
+
+
+def decode_link_token(token: str) -> dict:
+    """
+    Decode and verify an activation or password reset token.
+
+    These tokens are single-use, so unlike access and refresh tokens they
+    are not cached. Raises the usual ``jwt.InvalidTokenError`` subclasses.
+    """
+    return _jwt.decode(token, _LINK_VERIFY_KEY, algorithms=_ALGORITHMS)
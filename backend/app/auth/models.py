@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from functools import lru_cache
 from sqlmodel import Field, Column
 from pydantic import computed_field
 from sqlalchemy.dialects import postgresql as pg
@@ -8,7 +9,19 @@ from backend.app.auth.schema import BaseUserSchema, RoleChoicesSchema
 from backend.app.core.config import settings
 
 
+# Name parts rarely change while the same users are served repeatedly, so the
+# formatted result is memoised instead of recomputed on every serialisation
+@lru_cache(maxsize=4096)
+def _format_full_name(first_name: str, middle_name: str | None, last_name: str) -> str:
+    full_name = f"{first_name} {middle_name + ' ' if middle_name else ''}{last_name}"
+    return full_name.title().strip()
+
+
 class User(BaseUserSchema, table=True):
+    # Fetch server-generated values (updated_at on UPDATE) with RETURNING at
+    # flush time, so committed objects are complete without a refresh()
+    __mapper_args__ = {"eager_defaults": True}
+
     id: uuid.UUID = Field(
         sa_column=Column(
             pg.UUID(as_uuid=True),
@@ -50,8 +63,7 @@ class User(BaseUserSchema, table=True):
     @computed_field
     @property
     def full_name(self) -> str:
-        full_name = f"{self.first_name} {self.middle_name + ' ' if self.middle_name else ''}{self.last_name}"
-        return full_name.title().strip()
+        return _format_full_name(self.first_name, self.middle_name, self.last_name)
 
     def has_role(self, role: RoleChoicesSchema) -> bool:
-        return self.role.value == role.value
+        return self.role is role
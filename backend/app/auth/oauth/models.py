@@ -30,6 +30,7 @@ class UserProvider(SQLModel, table=True):
             pg.UUID(as_uuid=True),
             ForeignKey("user.id", ondelete="CASCADE"),
             nullable=False,
+            index=True,
         )
     )
     provider: str = Field(max_length=50)
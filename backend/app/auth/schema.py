@@ -1,10 +1,16 @@
 import uuid
 from enum import Enum
+from typing import TYPE_CHECKING
+
+import msgspec
 from sqlmodel import SQLModel, Field
 from pydantic import EmailStr, field_validator
 from fastapi import HTTPException, status
 from backend.app.core.i18n import _
 
+if TYPE_CHECKING:
+    from backend.app.auth.models import User
+
 
 class SecurityQuestionSchema(str, Enum):
     MOTHER_MAIDEN_NAME = "mother_median_name"
@@ -25,6 +31,8 @@ class SecurityQuestionSchema(str, Enum):
         return descriptions.get(value, "Unknown security question")
 
 
+# Loaded from the database as enum members (stored by name), so status checks
+# compare by identity instead of going through str.__eq__.
 class AccountStatusSchema(str, Enum):
     ACTIVE = "active"
     INACTIVE = "inactive"
@@ -139,3 +147,41 @@ class ConfirmPasswordResetSchema(SQLModel):
                 },
             )
         return v
+
+
+# ---------------------------------------------------------------------------
+# Login responses — msgspec structs encoded straight to JSON bytes, bypassing
+# FastAPI's jsonable_encoder on the login/refresh hot path.
+# ---------------------------------------------------------------------------
+
+
+class UserPublicSchema(msgspec.Struct, omit_defaults=True):
+    email: str
+    username: str | None
+    first_name: str
+    last_name: str
+    full_name: str
+    id_no: int | None
+    role: RoleChoicesSchema
+    account_status: AccountStatusSchema | None = None
+
+    @classmethod
+    def from_user(
+        cls, user: "User", include_status: bool = False
+    ) -> "UserPublicSchema":
+        return cls(
+            email=user.email,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            full_name=user.full_name,
+            id_no=user.id_no,
+            role=user.role,
+            account_status=user.account_status if include_status else None,
+        )
+
+
+class LoginResponseSchema(msgspec.Struct, omit_defaults=True):
+    message: str
+    user: UserPublicSchema
+    kyc_required: bool | None = None
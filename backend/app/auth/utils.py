@@ -1,21 +1,92 @@
-import random
+import asyncio
+import base64
+import hmac
+import multiprocessing
+import os
+import secrets
 import string
+import time
 import uuid
 import jwt
-from datetime import datetime, timedelta, timezone
+import msgspec
+from cachetools import TTLCache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
 
 from fastapi import Response
-from argon2 import PasswordHasher
+from argon2 import PasswordHasher, Type
 from argon2.exceptions import VerifyMismatchError
 
 from backend.app.core.config import settings
 
-_ph = PasswordHasher()
+_ph = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+    parallelism=settings.ARGON2_PARALLELISM,
+    type=Type.ID,
+)
+
+# Verified against when no user matches a login attempt, so unknown emails cost
+# as much hashing time as real ones and cannot be told apart by response time.
+DUMMY_PASSWORD_HASH = _ph.hash(secrets.token_urlsafe(32))
+
+# Stored for accounts without a password (OAuth sign-ups). Not a valid Argon2
+# hash, so no password can ever match it.
+UNUSABLE_PASSWORD_PREFIX = "!"
+OAUTH_PASSWORD_HASH = f"{UNUSABLE_PASSWORD_PREFIX}oauth"
+
+
+# Argon2 is CPU-bound; hashing runs in worker processes so concurrent logins use
+# every core instead of stalling the event loop. Started by the app lifespan.
+_kdf_pool: ProcessPoolExecutor | None = None
+
+
+def start_kdf_pool() -> None:
+    """Start the process pool used for password hashing."""
+    global _kdf_pool
+    if _kdf_pool is None:
+        _kdf_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+
+def shutdown_kdf_pool() -> None:
+    """Stop the password hashing process pool."""
+    global _kdf_pool
+    if _kdf_pool is not None:
+        _kdf_pool.shutdown(wait=True, cancel_futures=True)
+        _kdf_pool = None
+
+
+async def run_in_kdf_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a password hashing function off the event loop. Falls back to the
+    loop's default thread pool when the process pool is not running.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_kdf_pool, func, *args)
+
+
+def argon2_library_path() -> str | None:
+    """
+    Return the path of the shared libargon2 the bindings are linked against,
+    or None when they use the copy compiled into argon2-cffi-bindings.
+    """
+    try:
+        with open("/proc/self/maps") as maps:
+            for line in maps:
+                if "libargon2" in line:
+                    return line.split()[-1]
+    except OSError:
+        pass
+    return None
 
 
 def generate_otp(length=6) -> str:
     """Generate a random OTP of specified length."""
-    return "".join(random.choices(string.digits, k=length))
+    # One CSPRNG draw, zero-padded; OTPs must not come from the random module
+    return f"{secrets.randbelow(10**length):0{length}d}"
 
 
 def generate_password_hash(password: str) -> str:
@@ -25,114 +96,216 @@ def generate_password_hash(password: str) -> str:
 
 def verify_password_hash(password: str, hashed_password: str) -> bool:
     """Verify the password against the hashed password."""
+    if hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        # Still pay for one verification so password-less accounts cannot be
+        # told apart from real ones by response time
+        verify_password_hash(password, DUMMY_PASSWORD_HASH)
+        return False
     try:
         return _ph.verify(hashed_password, password)
     except VerifyMismatchError:
         return False
 
 
+# SITE_NAME is fixed for the process, so the username layout is computed once
+_USERNAME_PREFIX = "".join(word[0] for word in settings.SITE_NAME.split()).upper()
+_USERNAME_SUFFIX_LENGTH = 12 - len(_USERNAME_PREFIX) - 1
+_USERNAME_ALPHABET = string.ascii_uppercase + string.digits
+_USERNAME_SUFFIX_SPACE = len(_USERNAME_ALPHABET) ** _USERNAME_SUFFIX_LENGTH
+
+
 def generate_username() -> str:
     """Generate a random username."""
-    bank_name = settings.SITE_NAME
-    words = bank_name.split()
-    prefix = "".join([word[0] for word in words]).upper()
-    remaining_length = 12 - len(prefix) - 1
-    random_string = "".join(
-        random.choices(string.ascii_uppercase + string.digits, k=remaining_length)
-    )
-    return f"{prefix}-{random_string}"
+    # Draw the whole suffix at once and spell it out in base len(alphabet)
+    value = secrets.randbelow(_USERNAME_SUFFIX_SPACE)
+    random_string = ""
+    for _ in range(_USERNAME_SUFFIX_LENGTH):
+        value, index = divmod(value, len(_USERNAME_ALPHABET))
+        random_string += _USERNAME_ALPHABET[index]
+    return f"{_USERNAME_PREFIX}-{random_string}"
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+_HMAC_DIGESTS = {"HS256": "sha256", "HS384": "sha384", "HS512": "sha512"}
+
+
+def _hmac_template(key: str) -> "hmac.HMAC | None":
+    # For HMAC algorithms the key schedule (ipad/opad) is computed once; each
+    # token signs with a copy of the template. Other algorithms go through PyJWT.
+    if settings.JWT_ALGORITHM not in _HMAC_DIGESTS:
+        return None
+    return hmac.new(key.encode(), digestmod=_HMAC_DIGESTS[settings.JWT_ALGORITHM])
+
+
+# Session tokens are signed with SIGNING_KEY, activation and password reset
+# links with JWT_SECRET_KEY
+_jwt_hmac_template = _hmac_template(settings.SIGNING_KEY)
+_link_hmac_template = _hmac_template(settings.JWT_SECRET_KEY)
+# Same header PyJWT emits, so tokens are byte-for-byte compatible
+_jwt_header_segment = _b64url(
+    msgspec.json.encode({"alg": settings.JWT_ALGORITHM, "typ": "JWT"})
+)
+
+
+# Shared codec for algorithms without an HMAC template
+_pyjwt = jwt.PyJWT()
+
+
+def _encode_jwt(payload: dict, key: str, template: "hmac.HMAC | None") -> str:
+    if template is None:
+        return _pyjwt.encode(payload, key, algorithm=settings.JWT_ALGORITHM)
+
+    signing_input = _jwt_header_segment + b"." + _b64url(msgspec.json.encode(payload))
+    mac = template.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode()
+
+
+# Token lifetimes only depend on settings, so they are computed once
+_ACTIVATION_TOKEN_LIFETIME_SECONDS = settings.ACTIVATION_TOKEN_EXPIRATION_MINUTES * 60
+_PASSWORD_RESET_TOKEN_LIFETIME_SECONDS = (
+    settings.PASSWORD_RESET_TOKEN_EXPIRATION_MINUTES * 60
+)
+_ACCESS_TOKEN_LIFETIME_SECONDS = settings.JWT_ACCESS_TOKEN_EXPIRATION_MINUTES * 60
+_REFRESH_TOKEN_LIFETIME_SECONDS = (
+    settings.JWT_REFRESH_TOKEN_EXPIRATION_DAYS * 24 * 60 * 60
+)
+
+
+# Activation tokens recently issued per user, returned again for repeated
+# requests (e.g. resend clicks). Entries live for a quarter of the token
+# lifetime, so a reused token always has most of its validity left.
+_activation_tokens: TTLCache = TTLCache(
+    maxsize=10_000, ttl=_ACTIVATION_TOKEN_LIFETIME_SECONDS / 4
+)
 
 
 def create_activation_token(id: uuid.UUID) -> str:
     """Generate a JWT activation token."""
+    key = str(id)
+    token = _activation_tokens.get(key)
+    if token is not None:
+        return token
+
+    now = int(time.time())
     payload = {
         "id": str(id),
         "type": "activation",
-        "exp": datetime.now(timezone.utc)
-        + timedelta(minutes=settings.ACTIVATION_TOKEN_EXPIRATION_MINUTES),
-        "iat": datetime.now(timezone.utc),
+        "exp": now + _ACTIVATION_TOKEN_LIFETIME_SECONDS,
+        "iat": now,
     }
-    token = jwt.encode(
-        payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-    )
+    token = _encode_jwt(payload, settings.JWT_SECRET_KEY, _link_hmac_template)
+    _activation_tokens[key] = token
     return token
 
 
 def create_jwt_token(id: uuid.UUID, type: str = settings.COOKIE_ACCESS_NAME) -> str:
     if type == settings.COOKIE_ACCESS_NAME:
-        expire_delta = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRATION_MINUTES)
+        expire_seconds = _ACCESS_TOKEN_LIFETIME_SECONDS
     else:
-        expire_delta = timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRATION_DAYS)
+        expire_seconds = _REFRESH_TOKEN_LIFETIME_SECONDS
 
+    now = int(time.time())
     payload = {
         "id": str(id),
         "type": type,
-        "exp": datetime.now(timezone.utc) + expire_delta,
-        "iat": datetime.now(timezone.utc),
+        "exp": now + expire_seconds,
+        "iat": now,
     }
-    token = jwt.encode(payload, settings.SIGNING_KEY, algorithm=settings.JWT_ALGORITHM)
-    return token
+    return _encode_jwt(payload, settings.SIGNING_KEY, _jwt_hmac_template)
+
+
+def _cookie_attributes(max_age: int, httponly: bool) -> str:
+    # Same attribute order as Starlette's Response.set_cookie
+    attributes = ["HttpOnly"] if httponly else []
+    attributes += [
+        f"Max-Age={max_age}",
+        f"Path={settings.COOKIE_PATH}",
+        f"SameSite={settings.COOKIE_SAME_SITE}",
+    ]
+    if settings.COOKIE_SECURE:
+        attributes.append("Secure")
+    return "; " + "; ".join(attributes)
+
+
+# Set-Cookie attributes only depend on settings, so they are formatted once and
+# set_auth_cookies only has to prepend the token values.
+_ACCESS_COOKIE_PREFIX = f"{settings.COOKIE_ACCESS_NAME}="
+_ACCESS_COOKIE_SUFFIX = _cookie_attributes(
+    _ACCESS_TOKEN_LIFETIME_SECONDS, settings.COOKIE_HTTP_ONLY
+)
+_REFRESH_COOKIE_PREFIX = f"{settings.COOKIE_REFRESH_NAME}="
+_REFRESH_COOKIE_SUFFIX = _cookie_attributes(
+    _REFRESH_TOKEN_LIFETIME_SECONDS, settings.COOKIE_HTTP_ONLY
+)
+_LOGGED_IN_COOKIE_HEADER = (
+    b"set-cookie",
+    (
+        f"{settings.COOKIE_LOGGED_IN_NAME}=true"
+        + _cookie_attributes(_ACCESS_TOKEN_LIFETIME_SECONDS, httponly=False)
+    ).encode("latin-1"),
+)
 
 
 def set_auth_cookies(
     response: Response, access_token: str, refresh_token: str | None = None
 ) -> None:
-    cookie_settings = {
-        "path": settings.COOKIE_PATH,
-        "secure": settings.COOKIE_SECURE,
-        "httponly": settings.COOKIE_HTTP_ONLY,
-        "samesite": settings.COOKIE_SAME_SITE,
-    }
-    access_cookie_settings = cookie_settings.copy()
-    access_cookie_settings["max_age"] = (
-        settings.JWT_ACCESS_TOKEN_EXPIRATION_MINUTES * 60
-    )
-    response.set_cookie(
-        key=settings.COOKIE_ACCESS_NAME,
-        value=access_token,
-        **access_cookie_settings,
+    # JWTs are base64url segments joined by dots, so they need no cookie quoting
+    headers = response.raw_headers
+    headers.append(
+        (
+            b"set-cookie",
+            (_ACCESS_COOKIE_PREFIX + access_token + _ACCESS_COOKIE_SUFFIX).encode(
+                "latin-1"
+            ),
+        )
     )
     if refresh_token:
-        refresh_cookie_settings = cookie_settings.copy()
-        refresh_cookie_settings["max_age"] = (
-            settings.JWT_REFRESH_TOKEN_EXPIRATION_DAYS * 24 * 60 * 60
-        )
-        response.set_cookie(
-            key=settings.COOKIE_REFRESH_NAME,
-            value=refresh_token,
-            **refresh_cookie_settings,
+        headers.append(
+            (
+                b"set-cookie",
+                (
+                    _REFRESH_COOKIE_PREFIX + refresh_token + _REFRESH_COOKIE_SUFFIX
+                ).encode("latin-1"),
+            )
         )
+    headers.append(_LOGGED_IN_COOKIE_HEADER)
 
-    logged_in_cookie_settings = cookie_settings.copy()
-    logged_in_cookie_settings["httponly"] = False
-    logged_in_cookie_settings["max_age"] = (
-        settings.JWT_ACCESS_TOKEN_EXPIRATION_MINUTES * 60
-    )
-    response.set_cookie(
-        key=settings.COOKIE_LOGGED_IN_NAME,
-        value="true",
-        **logged_in_cookie_settings,
+
+def _deleted_cookie_headers() -> tuple[tuple[bytes, bytes], ...]:
+    # Rendered by Starlette itself so the headers match Response.delete_cookie;
+    # the expires date is import time, already in the past for any response
+    response = Response()
+    for key in (
+        settings.COOKIE_ACCESS_NAME,
+        settings.COOKIE_REFRESH_NAME,
+        settings.COOKIE_LOGGED_IN_NAME,
+    ):
+        response.delete_cookie(key=key, path=settings.COOKIE_PATH)
+    return tuple(
+        header for header in response.raw_headers if header[0] == b"set-cookie"
     )
 
 
+_DELETED_COOKIE_HEADERS = _deleted_cookie_headers()
+
+
 def delete_auth_cookies(response: Response) -> None:
-    response.delete_cookie(key=settings.COOKIE_ACCESS_NAME, path=settings.COOKIE_PATH)
-    response.delete_cookie(key=settings.COOKIE_REFRESH_NAME, path=settings.COOKIE_PATH)
-    response.delete_cookie(
-        key=settings.COOKIE_LOGGED_IN_NAME, path=settings.COOKIE_PATH
-    )
+    response.raw_headers.extend(_DELETED_COOKIE_HEADERS)
 
 
 def create_password_reset_token(id: uuid.UUID) -> str:
     """Generate a JWT password reset token."""
+    # Always fresh: a repeat request may mean the previous email was lost or
+    # compromised, or its token already used
+    now = int(time.time())
     payload = {
         "id": str(id),
         "type": "password_reset",
-        "exp": datetime.now(timezone.utc)
-        + timedelta(minutes=settings.PASSWORD_RESET_TOKEN_EXPIRATION_MINUTES),
-        "iat": datetime.now(timezone.utc),
+        "exp": now + _PASSWORD_RESET_TOKEN_LIFETIME_SECONDS,
+        "iat": now,
     }
-    token = jwt.encode(
-        payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-    )
-    return token
+    return _encode_jwt(payload, settings.JWT_SECRET_KEY, _link_hmac_template)
@@ -8,10 +8,11 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    # Serialization settings
-    task_serializer="json",
-    result_serializer="json",
-    accept_content=["application/json"],
+    # Serialization settings: msgpack is smaller and faster to encode than
+    # JSON; JSON stays accepted for messages queued before the switch
+    task_serializer="msgpack",
+    result_serializer="msgpack",
+    accept_content=["application/x-msgpack", "application/json"],
     # Task/result handling:
     task_track_started=True,
     task_send_sent_event=True,
@@ -29,11 +30,15 @@ celery_app.conf.update(
     # Queues:
     task_default_queue="nextgen_tasks",
     task_create_missing_queues=True,
-    # Worker process control:
+    # Broker connections are pooled and reused across bursts of tasks
+    broker_pool_limit=20,
+    broker_connection_retry_on_startup=True,
+    # Worker process control: email tasks are short, so each worker takes a few
+    # at a time (safe with acks_late) and child processes are recycled rarely
     worker_send_task_events=True,
-    worker_prefetch_multiplier=1,
-    worker_max_tasks_per_child=1000,
-    worker_max_memory_per_child=50000,
+    worker_prefetch_multiplier=4,
+    worker_max_tasks_per_child=10000,
+    worker_max_memory_per_child=500000,
     worker_log_format="[%(asctime)s: %(levelname)s/$(processName)s] [%(taskname)s(%(taskid)s)] %(message)s",
 )
 
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -12,6 +13,8 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         env_ignore_empty=True,
         extra="ignore",
+        # Read once at startup; nothing may change it at runtime
+        frozen=True,
     )
 
     ENVIRONMENT: Literal["development", "staging", "production"] = "development"
@@ -21,12 +24,21 @@ class Settings(BaseSettings):
     API_V1_STR: str = ""
     SITE_NAME: str = ""
     DATABASE_URL: str = ""
+    # Connection pool per worker process; pool_size + max_overflow is the most
+    # connections one worker will open
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 40
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    # Comma-separated model modules to import instead of scanning for models.py
+    MODEL_MODULES: str = ""
 
     MAIL_FROM: str = ""
     MAIL_FROM_NAME: str = ""
     SMTP_HOST: str = "mailpit"
     SMTP_PORT: int = 1025
     MAILPIT_UI_PORT: int = 8025
+    # Render email templates in a worker thread instead of on the event loop
+    EMAIL_RENDER_IN_THREAD: bool = True
 
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
@@ -60,6 +72,13 @@ class Settings(BaseSettings):
     COOKIE_SAME_SITE: str = "lax"
     SIGNING_KEY: str = ""
     PASSWORD_RESET_TOKEN_EXPIRATION_MINUTES: int = 3 if ENVIRONMENT == "local" else 5
+    # Argon2id cost parameters for new hashes; existing hashes keep the ones
+    # encoded in them. Parallelism should not exceed the physical core count.
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # Per-client token bucket shared by the /auth endpoints, "<count>/<second|minute|hour>"
+    AUTH_RATE_LIMIT: str = "10/minute"
 
     # Google OAuth settings
     GOOGLE_CLIENT_ID: str = ""
@@ -76,4 +95,10 @@ class Settings(BaseSettings):
     ]  # English, Arabic, French, Spanish
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment only once."""
+    return Settings()
+
+
+settings = get_settings()
@@ -1,10 +1,15 @@
 import asyncio
+from contextlib import AsyncExitStack
 from typing import AsyncGenerator, Annotated
 
 from fastapi import Depends
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import (
+    async_scoped_session,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 
@@ -19,10 +24,20 @@ engine = create_async_engine(
     settings.DATABASE_URL,
     poolclass=AsyncAdaptedQueuePool,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_timeout=30,
-    pool_recycle=1800,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
+    # Reuse the most recently returned connection, whose prepared statements
+    # and server-side caches are warm; surplus idle connections age out
+    pool_use_lifo=True,
+    connect_args={
+        # SQLAlchemy's and asyncpg's per-connection prepared statement caches
+        "prepared_statement_cache_size": 512,
+        "statement_cache_size": 1024,
+        # JIT compilation only costs time on short OLTP queries
+        "server_settings": {"jit": "off"},
+    },
 )
 
 async_session_factory = async_sessionmaker(
@@ -31,31 +46,17 @@ async_session_factory = async_sessionmaker(
     class_=AsyncSession,
 )
 
+# One session per request task for short read-heavy handlers that do not need
+# the SessionDep dependency. Closed by DBSessionMiddleware when the request ends.
+scoped_session = async_scoped_session(
+    async_session_factory, scopefunc=asyncio.current_task
+)
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    session = async_session_factory()
-    try:
+    # Closing the session rolls back any transaction left open by an error
+    async with async_session_factory() as session:
         yield session
-    except Exception as e:
-        logger.error(f"An error occurred while getting the database session: {e}")
-        if session:
-            try:
-                await session.rollback()
-                logger.info("Database session rolled back session after error")
-            except Exception as rollback_error:
-                logger.error(
-                    f"An error occurred while rolling back the database session: {rollback_error}"
-                )
-        raise
-    finally:
-        if session:
-            try:
-                await session.close()
-                logger.debug("Database session closed successfully")
-            except Exception as close_error:
-                logger.error(
-                    f"An error occurred while closing the database session: {close_error}"
-                )
 
 
 SessionDep = Annotated[AsyncSession, Depends(get_async_session)]
@@ -88,3 +89,21 @@ async def init_db() -> None:
     except Exception as e:
         logger.error(f"An error occurred during database initialization: {e}")
         raise
+
+
+async def warm_pool() -> None:
+    """Open the pool's base connections up front so early requests skip the handshake."""
+    try:
+        # Hold every connection at once so the pool has to open distinct ones
+        async with AsyncExitStack() as stack:
+            await asyncio.gather(
+                *(
+                    stack.enter_async_context(engine.connect())
+                    for _ in range(settings.DATABASE_POOL_SIZE)
+                )
+            )
+        logger.info(
+            f"Database pool warmed with {settings.DATABASE_POOL_SIZE} connections"
+        )
+    except Exception as e:
+        logger.warning(f"Database pool warm-up failed: {e}")
@@ -1,5 +1,7 @@
+import asyncio
+from backend.app.core.config import settings
 from backend.app.core.emails.config import TEMPLATES_DIR
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 from jinja2.ext import i18n as jinja2_i18n
 from backend.app.core.logging import get_logger
 from backend.app.core.emails.tasks import send_email_task
@@ -7,26 +9,42 @@ from backend.app.core.i18n import get_translations, get_current_language
 
 logger = get_logger()
 
-# Create Jinja2 environment with i18n support
-email_env = Environment(
-    loader=FileSystemLoader(TEMPLATES_DIR),
-    autoescape=True,
-    extensions=[jinja2_i18n],
-)
 
-
-def update_jinja_translations():
-    """Update Jinja2 environment with current language translations."""
-    lang = get_current_language()
-    translations = get_translations(lang)
+def _create_email_env(language: str) -> Environment:
+    """Create a Jinja2 environment with the translations of one language installed."""
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        extensions=[jinja2_i18n],
+        # Templates ship with the code, so compiled ones are kept for good
+        auto_reload=False,
+        cache_size=-1,
+    )
+    translations = get_translations(language)
     if translations:
-        email_env.install_gettext_translations(translations, newstyle=True)
+        env.install_gettext_translations(translations, newstyle=True)
     else:
-        email_env.install_null_translations(newstyle=True)
+        env.install_null_translations(newstyle=True)
+    return env
+
+
+# One environment per language, so concurrent renders in different languages
+# never reinstall translations on a shared environment
+_email_envs: dict[str, Environment] = {
+    language: _create_email_env(language) for language in settings.SUPPORTED_LANGUAGES
+}
+
+
+def get_email_env(language: str) -> Environment:
+    """Return the Jinja2 environment for a language, or the default language's."""
+    return _email_envs.get(language) or _email_envs[settings.DEFAULT_LANGUAGE]
 
 
-# Initialize with default translations
-update_jinja_translations()
+# HTML size in characters above which queued email tasks are compressed
+_COMPRESS_EMAIL_HTML_OVER = 4096
+
+# Compiled (html, plain) templates per email class and language
+_compiled_templates: dict[tuple[type, str], tuple[Template, Template]] = {}
 
 
 class EmailTemplate:
@@ -34,6 +52,25 @@ class EmailTemplate:
     template_name_plain: str
     subject: str
 
+    @classmethod
+    def _get_templates(cls, language: str) -> tuple[Template, Template]:
+        key = (cls, language)
+        templates = _compiled_templates.get(key)
+        if templates is None:
+            email_env = get_email_env(language)
+            templates = (
+                email_env.get_template(cls.template_name),
+                email_env.get_template(cls.template_name_plain),
+            )
+            _compiled_templates[key] = templates
+        return templates
+
+    @staticmethod
+    def _render(
+        html_template: Template, plain_template: Template, context: dict
+    ) -> tuple[str, str]:
+        return html_template.render(**context), plain_template.render(**context)
+
     @classmethod
     async def send_email(
         cls,
@@ -46,18 +83,26 @@ class EmailTemplate:
             if not cls.template_name or not cls.template_name_plain:
                 raise ValueError("Template names must be defined in the subclass.")
 
-            # Update Jinja2 with current language translations
-            update_jinja_translations()
-
-            html_template = email_env.get_template(cls.template_name)
-            plain_template = email_env.get_template(cls.template_name_plain)
-            html_content = html_template.render(**context)
-            plain_content = plain_template.render(**context)
-            send_email_task.delay(
-                recipients=recipients_list,
-                subject=subject_override or cls.subject,
-                html_content=html_content,
-                plain_content=plain_content,
+            html_template, plain_template = cls._get_templates(get_current_language())
+            if settings.EMAIL_RENDER_IN_THREAD:
+                html_content, plain_content = await asyncio.to_thread(
+                    cls._render, html_template, plain_template, context
+                )
+            else:
+                html_content, plain_content = cls._render(
+                    html_template, plain_template, context
+                )
+            send_email_task.apply_async(
+                kwargs={
+                    "recipients": recipients_list,
+                    "subject": subject_override or cls.subject,
+                    "html_content": html_content,
+                    "plain_content": plain_content,
+                },
+                # Rendered HTML compresses well; small bodies are not worth it
+                compression=(
+                    "zlib" if len(html_content) > _COMPRESS_EMAIL_HTML_OVER else None
+                ),
             )
             logger.info(
                 f"Email task queued for {recipients_list} with subject '{subject_override or cls.subject}'"
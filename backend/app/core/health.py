@@ -1,10 +1,13 @@
 import asyncio
+import time
+from dataclasses import dataclass
 from typing import Dict, Any, Callable, Awaitable, Optional
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from sqlalchemy import text
 from backend.app.core.db import async_session_factory
 from backend.app.core.celery_app import celery_app
+from backend.app.core.redis_client import redis_client
 from backend.app.core.logging import get_logger
 
 logger = get_logger()
@@ -18,24 +21,30 @@ class ServiceStatus(str, Enum):
     DOWN = "down"
 
 
+@dataclass(slots=True)
+class ServiceRecord:
+    """Registration and latest state of one monitored service."""
+
+    status: ServiceStatus
+    check_function: Callable[[], Awaitable[bool]]
+    last_check: datetime  # Timestamp of the last successful health check
+    timeout: float
+    retry_delay: float
+    max_retries: int
+    dependencies: frozenset[str]
+
+
 class HealthCheck:
     def __init__(self):
-        self._services: Dict[str, ServiceStatus] = {}
-        self._check_functions: Dict[str, Callable[[], Awaitable[bool]]] = {}
-        self._last_check: Dict[
-            str, datetime
-        ] = {}  # Timestamp of the last health check per service
-        self._timeout: Dict[str, float] = {}
-        self._retry_delays: Dict[str, float] = {}
-        self._max_retries: Dict[str, int] = {}
-        self._dependencies: Dict[str, set[str]] = {}
+        self._records: Dict[str, ServiceRecord] = {}
         self._lock = asyncio.Lock()
 
         self._cache_duration: timedelta = timedelta(seconds=30)
-        self._cached_status: Optional[Dict[str, Any]] = None
-        self._last_check_time: Optional[datetime] = (
-            None  # Timestamp of the last health check was run
-        )
+        # (monotonic deadline, status) of the last full check, replaced as a
+        # whole so the cache can be read without taking a lock
+        self._cache: Optional[tuple[float, Dict[str, Any]]] = None
+        # Serialises cache refreshes only; _lock guards the registries
+        self._refresh_lock = asyncio.Lock()
 
     async def validate_dependencies(
         self, service_name: str, depends_on: list[str]
@@ -44,7 +53,7 @@ class HealthCheck:
             return
 
         for dependency in depends_on:
-            if dependency not in self._services:
+            if dependency not in self._records:
                 raise ValueError(
                     f"Service '{service_name}' depends on unknown service '{dependency}'"
                 )
@@ -59,24 +68,25 @@ class HealthCheck:
         max_retries: int = 3,
     ) -> None:
         async with self._lock:
-            if name in self._services:
+            if name in self._records:
                 raise ValueError(f"Service '{name}' is already registered")
 
             if depends_on is None:
                 depends_on = []
-
-            self._services[name] = ServiceStatus.STARTING
-            self._check_functions[name] = check_function
-            self._last_check[name] = (
-                datetime.now(timezone.utc) - self._cache_duration
-            )  # Force an immediate check on first status request
-            self._timeout[name] = timeout
-            self._retry_delays[name] = retry_delay
-            self._max_retries[name] = max_retries
+            await self.validate_dependencies(name, depends_on)
+
+            self._records[name] = ServiceRecord(
+                status=ServiceStatus.STARTING,
+                check_function=check_function,
+                # Force an immediate check on first status request
+                last_check=datetime.now(timezone.utc) - self._cache_duration,
+                timeout=timeout,
+                retry_delay=retry_delay,
+                max_retries=max_retries,
+                dependencies=frozenset(depends_on),
+            )
 
             if depends_on:
-                await self.validate_dependencies(name, depends_on)
-                self._dependencies[name] = set(depends_on)
                 logger.info(
                     f"Service '{name}' registered with dependencies: {depends_on}"
                 )
@@ -88,19 +98,16 @@ class HealthCheck:
             async with async_session_factory() as session:
                 await session.execute(text("SELECT 1"))
                 await session.commit()
-
-                self._last_check["database"] = datetime.now(timezone.utc)
                 return True
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
             return False
 
     async def check_redis(self) -> bool:
+        # Pinged through the shared async client, which talks to the same Redis
+        # instance as the Celery result backend
         try:
-            redis_client = celery_app.backend.client
-            redis_client.ping()
-
-            self._last_check["redis"] = datetime.now(timezone.utc)
+            await redis_client.ping()
             return True
         except Exception as e:
             logger.error(f"Redis health check failed: {e}")
@@ -109,47 +116,104 @@ class HealthCheck:
     # Check if the health of celery or rabbitmq is healthy
     async def check_celery(self) -> bool:
         try:
-            inspect = celery_app.control.inspect()
-            workers = inspect.ping()
-
-            if not workers:
-                conn = celery_app.connection()
-                try:
-                    conn.ensure_connection(max_retries=3)
-                    logger.warning(
-                        "No celery workers found, but connection to RabbitMQ is healthy"
-                    )
-                    self._last_check["celery"] = datetime.now(timezone.utc)
-                    return True
-                finally:
-                    conn.close()
-
-            self._last_check["celery"] = datetime.now(timezone.utc)
+            await asyncio.to_thread(self._ping_celery)
             return True
         except Exception as e:
             logger.error(f"Celery connection check failed: {e}")
             return False
 
+    def _ping_celery(self) -> None:
+        # Bounded broadcast so a stuck broker cannot hold the thread for long
+        inspect = celery_app.control.inspect(timeout=0.5)
+        workers = inspect.ping()
+
+        if not workers:
+            conn = celery_app.connection()
+            try:
+                conn.ensure_connection(max_retries=3)
+                logger.warning(
+                    "No celery workers found, but connection to RabbitMQ is healthy"
+                )
+            finally:
+                conn.close()
+
     async def check_service_health(self, service_name: str) -> ServiceStatus:
-        # Check the health of dependencies first
-        if service_name in self._dependencies:
-            for dependency in self._dependencies[service_name]:
-                dep_status = await self.check_service_health(dependency)
-                if dep_status != ServiceStatus.HEALTHY:
+        result = (await self._check_services([service_name]))[service_name]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _check_services(self, services: list[str]) -> Dict[str, Any]:
+        """
+        Check the given services and everything they depend on, each exactly
+        once, dependencies first. A service whose dependency is not healthy is
+        reported as DEGRADED without running its own check. Failed checks are
+        returned as exceptions rather than raised.
+        """
+        async with self._lock:
+            dependencies = {
+                name: record.dependencies for name, record in self._records.items()
+            }
+
+        pending: set[str] = set()
+        stack = list(services)
+        while stack:
+            name = stack.pop()
+            if name not in pending:
+                pending.add(name)
+                stack.extend(dependencies.get(name, ()))
+
+        # Kahn's algorithm, one layer at a time: every service in a layer only
+        # depends on earlier layers, so a layer's checks run concurrently.
+        # Dependencies must be registered first, so the graph has no cycles.
+        remaining = {name: len(dependencies.get(name, ())) for name in pending}
+        dependents: Dict[str, list[str]] = {name: [] for name in pending}
+        for name in pending:
+            for dependency in dependencies.get(name, ()):
+                dependents[dependency].append(name)
+        layer = [name for name, count in remaining.items() if count == 0]
+
+        results: Dict[str, Any] = {}
+        while layer:
+            to_check = []
+            for name in layer:
+                unhealthy = [
+                    dependency
+                    for dependency in dependencies.get(name, ())
+                    if results[dependency] != ServiceStatus.HEALTHY
+                ]
+                if unhealthy:
                     logger.error(
-                        f"Dependency '{dependency}' for service '{service_name}' is not healthy: {dep_status}"
+                        f"Dependencies {unhealthy} for service '{name}' are not healthy"
                     )
-                    return ServiceStatus.DEGRADED
+                    results[name] = ServiceStatus.DEGRADED
+                else:
+                    to_check.append(name)
+            outcomes = await asyncio.gather(
+                *(self._run_single_check(name) for name in to_check),
+                return_exceptions=True,
+            )
+            results.update(zip(to_check, outcomes))
+
+            next_layer = []
+            for name in layer:
+                for dependent in dependents[name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_layer.append(dependent)
+            layer = next_layer
 
-        if service_name not in self._check_functions:
+        return results
+
+    async def _run_single_check(self, service_name: str) -> ServiceStatus:
+        record = self._records.get(service_name)
+        if record is None:
             raise ValueError(f"Service '{service_name}' is not registered")
 
-        check_function: Callable[[], Awaitable[bool]] = self._check_functions[
-            service_name
-        ]
-        timeout: float = self._timeout.get(service_name, 5.0)
-        retry_delay: float = self._retry_delays[service_name]
-        max_retries: int = self._max_retries[service_name]
+        check_function = record.check_function
+        timeout = record.timeout
+        retry_delay = record.retry_delay
+        max_retries = record.max_retries
 
         metrics = {"attempts": 0, "total_delay": 0.0, "last_error": None}
 
@@ -160,8 +224,8 @@ class HealthCheck:
                     is_healthy = await check_function()
                 if is_healthy:
                     async with self._lock:
-                        self._services[service_name] = ServiceStatus.HEALTHY
-                        self._last_check[service_name] = datetime.now(timezone.utc)
+                        record.status = ServiceStatus.HEALTHY
+                        record.last_check = datetime.now(timezone.utc)
 
                         if attempt > 0:
                             logger.info(
@@ -169,7 +233,7 @@ class HealthCheck:
                             )
                     return ServiceStatus.HEALTHY
                 async with self._lock:
-                    self._services[service_name] = ServiceStatus.DEGRADED
+                    record.status = ServiceStatus.DEGRADED
             except asyncio.TimeoutError:
                 metrics["last_error"] = (
                     f"Health check for service '{service_name}' timed out after {attempt + 1} attempts"
@@ -186,7 +250,7 @@ class HealthCheck:
             await asyncio.sleep(retry_delay)
 
         async with self._lock:
-            self._services[service_name] = ServiceStatus.UNHEALTHY
+            record.status = ServiceStatus.UNHEALTHY
             logger.error(
                 f"Service '{service_name}' is unhealthy after {metrics['attempts']} attempts: {metrics['last_error']}"
             )
@@ -194,46 +258,57 @@ class HealthCheck:
         return ServiceStatus.UNHEALTHY
 
     async def check_all_services(self) -> Dict[str, Any]:
+        cache = self._cache
+        if cache is not None and time.monotonic() < cache[0]:
+            return cache[1]
+
+        async with self._refresh_lock:
+            # Concurrent callers that missed the cache wait for one refresh
+            cache = self._cache
+            if cache is not None and time.monotonic() < cache[0]:
+                return cache[1]
+            return await self._refresh_status()
+
+    async def _refresh_status(self) -> Dict[str, Any]:
         current_time = datetime.now(timezone.utc)
-        if (
-            self._cached_status is not None
-            and self._last_check_time is not None
-            and current_time - self._last_check_time < self._cache_duration
-        ):
-            return self._cached_status
-
         async with self._lock:
-            services = list(self._services.keys())
-        tasks = [self.check_service_health(service) for service in services]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            services = list(self._records)
+        checked = await self._check_services(services)
 
+        services_status = {
+            service: self._service_entry(service, checked[service])
+            for service in services
+        }
         health_status = {
-            "status": ServiceStatus.HEALTHY,
+            "status": (
+                ServiceStatus.HEALTHY
+                if all(
+                    entry["status"] == ServiceStatus.HEALTHY
+                    for entry in services_status.values()
+                )
+                else ServiceStatus.DEGRADED
+            ),
             "time_stamp": current_time.isoformat(),
-            "services": {},
+            "services": services_status,
         }
 
-        for service, result in zip(services, results):
-            if isinstance(result, Exception):
-                health_status["services"][service] = {
-                    "status": ServiceStatus.UNHEALTHY,
-                    "error": str(result),
-                    "last_check": self._last_check[service].isoformat(),
-                }
-                health_status["status"] = ServiceStatus.DEGRADED
-            else:
-                health_status["services"][service] = {
-                    "status": result,
-                    "last_check": self._last_check[service].isoformat(),
-                }
-                if result != ServiceStatus.HEALTHY:
-                    health_status["status"] = ServiceStatus.DEGRADED
-
-        self._cached_status = health_status
-        self._last_check_time = current_time
+        self._cache = (
+            time.monotonic() + self._cache_duration.total_seconds(),
+            health_status,
+        )
 
         return health_status
 
+    def _service_entry(self, service: str, result: Any) -> Dict[str, Any]:
+        last_check = self._records[service].last_check.isoformat()
+        if isinstance(result, Exception):
+            return {
+                "status": ServiceStatus.UNHEALTHY,
+                "error": str(result),
+                "last_check": last_check,
+            }
+        return {"status": result, "last_check": last_check}
+
     async def wait_for_services(self, timeout: float = 30.0) -> bool:
         try:
             start_time = datetime.now(timezone.utc)
@@ -251,13 +326,7 @@ class HealthCheck:
 
     async def cleanup(self) -> None:
         async with self._lock:
-            self._services.clear()
-            self._check_functions.clear()
-            self._last_check.clear()
-            self._timeout.clear()
-            self._retry_delays.clear()
-            self._max_retries.clear()
-            self._dependencies.clear()
+            self._records.clear()
 
 
 health_checker = HealthCheck()
@@ -4,9 +4,9 @@ Provides translation support using Babel and gettext.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from contextvars import ContextVar
-from functools import lru_cache
+from functools import lru_cache, partial
 
 from babel import Locale
 from babel.support import Translations
@@ -17,37 +17,27 @@ from backend.app.core.logging import get_logger
 logger = get_logger()
 
 # Context variable to store current language for async operations
+_DEFAULT_LANGUAGE: str = settings.DEFAULT_LANGUAGE
+_SUPPORTED_LANGUAGES = frozenset(settings.SUPPORTED_LANGUAGES)
+
 current_language: ContextVar[str] = ContextVar(
-    "current_language", default=settings.DEFAULT_LANGUAGE
+    "current_language", default=_DEFAULT_LANGUAGE
 )
 
 # Base directory for translations
 LOCALES_DIR = Path(__file__).parent.parent / "locales"
 
 
-@lru_cache(maxsize=len(settings.SUPPORTED_LANGUAGES))
-def get_translations(language: str) -> Optional[Translations]:
-    """
-    Get translations for a specific language.
-    Uses LRU cache to avoid loading the same translation files multiple times.
+# Loaded catalogs per supported language, filled once at import by
+# preload_translations() so lookups never touch the filesystem
+_TRANSLATIONS: dict[str, Optional[Translations]] = {}
 
-    Args:
-        language: Language code (e.g., 'en', 'ar', 'fr')
 
-    Returns:
-        Translations object or None if not found
-    """
+def _load_translations(language: str) -> Optional[Translations]:
     try:
-        if language not in settings.SUPPORTED_LANGUAGES:
-            logger.warning(
-                f"Unsupported language: {language}, falling back to {settings.DEFAULT_LANGUAGE}"
-            )
-            language = settings.DEFAULT_LANGUAGE
-
-        translations = Translations.load(
+        return Translations.load(
             dirname=str(LOCALES_DIR), locales=[language], domain="messages"
         )
-        return translations
     except FileNotFoundError:
         logger.warning(f"Translation file not found for language: {language}")
         return None
@@ -56,6 +46,28 @@ def get_translations(language: str) -> Optional[Translations]:
         return None
 
 
+def preload_translations() -> None:
+    """Load the catalog and Babel locale of every supported language."""
+    for language in _SUPPORTED_LANGUAGES:
+        if language not in _TRANSLATIONS:
+            _TRANSLATIONS[language] = _load_translations(language)
+        get_locale(language)
+
+
+def get_translations(language: str) -> Optional[Translations]:
+    """
+    Get translations for a specific language.
+    Unsupported languages get the default language's catalog.
+
+    Args:
+        language: Language code (e.g., 'en', 'ar', 'fr')
+
+    Returns:
+        Translations object or None if not found
+    """
+    return _TRANSLATIONS.get(language, _DEFAULT_TRANSLATIONS)
+
+
 def _(message: str, **kwargs) -> str:
     """
     Translate a message to the current language.
@@ -75,23 +87,93 @@ def _(message: str, **kwargs) -> str:
         >>> _("Hello, {name}!", name="أحمد")
         "مرحباً، أحمد!"
     """
-    lang = current_language.get()
-    translations = get_translations(lang)
+    return _translate(current_language.get(), message, **kwargs)
+
+
+def _translate(language: str, message: str, /, **kwargs) -> str:
+    # Most messages take no format arguments
+    if not kwargs:
+        return _lookup(language, message)
+    # Only the template lookup is memoised; format arguments are often
+    # per-user values that should not be kept around
+    return _format_message(_lookup(language, message), message, kwargs)
 
+
+@lru_cache(maxsize=len(_SUPPORTED_LANGUAGES))
+def translator_for(language: str) -> Callable[..., str]:
+    """
+    Return a translation function bound to one language.
+    Works like _() without reading the current language on every call, e.g.
+    through request.state.t in route handlers.
+
+    Args:
+        language: Language code (e.g., 'en', 'ar', 'fr')
+
+    Returns:
+        Callable taking a message and optional format arguments
+    """
+    return partial(_translate, language)
+
+
+# Catalogs never change after loading, so translated strings can be memoised
+# for the process lifetime
+@lru_cache(maxsize=4096)
+def _lookup(language: str, message: str) -> str:
+    # Without a catalog the message object itself is returned, so callers can
+    # tell an untranslated message by identity
+    translations = get_translations(language)
+    return translations.gettext(message) if translations else message
+
+
+@lru_cache(maxsize=4096)
+def _lookup_plural(language: str, singular: str, plural: str, n: int) -> str:
+    translations = get_translations(language)
     if translations:
-        translated = translations.gettext(message)
-    else:
-        translated = message
+        return translations.ngettext(singular, plural, n)
+    return singular if n == 1 else plural
 
-    # Format the message with kwargs if provided
-    if kwargs:
-        try:
-            translated = translated.format(**kwargs)
-        except KeyError as e:
-            logger.warning(f"Missing format key in translation: {e}")
-            translated = message.format(**kwargs)
 
-    return translated
+def _format_message(translated: str, message: str, kwargs: dict) -> str:
+    if "{" not in translated and "}" not in translated:
+        return translated
+    try:
+        return translated.format(**kwargs)
+    except KeyError as e:
+        if translated is message:
+            # Untranslated: the source string itself lacks the key, so
+            # formatting it again would fail the same way
+            raise
+        logger.warning(f"Missing format key in translation: {e}")
+        return message.format(**kwargs)
+
+
+def N_(message: str) -> str:
+    """
+    Mark a message for extraction without translating it.
+    Pair with gettext_for() when the target language is chosen up front.
+
+    Args:
+        message: The message to mark (in English)
+
+    Returns:
+        The message unchanged
+    """
+    return message
+
+
+def gettext_for(language: str, message: str) -> str:
+    """
+    Translate a message to a specific language, ignoring the current language.
+    Used to precompute translations for every supported language at import time.
+
+    Args:
+        language: Language code (e.g., 'en', 'ar', 'fr')
+        message: The message to translate (in English)
+
+    Returns:
+        Translated message
+    """
+    return _lookup(language, message)
 
 
 def set_language(language: str) -> None:
@@ -101,11 +183,12 @@ def set_language(language: str) -> None:
     Args:
         language: Language code (e.g., 'en', 'ar', 'fr')
     """
-    if language in settings.SUPPORTED_LANGUAGES:
-        current_language.set(language)
-    else:
+    if language not in _SUPPORTED_LANGUAGES:
         logger.warning(f"Attempted to set unsupported language: {language}")
-        current_language.set(settings.DEFAULT_LANGUAGE)
+        language = _DEFAULT_LANGUAGE
+    # Setting the value already in context would only allocate a Token
+    if current_language.get() != language:
+        current_language.set(language)
 
 
 def get_current_language() -> str:
@@ -130,12 +213,21 @@ def get_locale(language: Optional[str] = None) -> Locale:
     """
     lang = language or current_language.get()
     try:
-        return Locale.parse(lang)
+        return _parse_locale(lang)
     except Exception as e:
         logger.error(f"Error parsing locale {lang}: {e}")
-        return Locale.parse(settings.DEFAULT_LANGUAGE)
+        return _parse_locale(_DEFAULT_LANGUAGE)
+
 
+# One Locale object per language code instead of a parse per call
+@lru_cache(maxsize=len(_SUPPORTED_LANGUAGES) + 4)
+def _parse_locale(language: str) -> Locale:
+    return Locale.parse(language)
 
+
+# Browsers send a small set of distinct headers, so results are memoised per
+# raw header value
+@lru_cache(maxsize=1024)
 def parse_accept_language(accept_language: Optional[str]) -> str:
     """
     Parse the Accept-Language header and return the best match.
@@ -151,34 +243,30 @@ def parse_accept_language(accept_language: Optional[str]) -> str:
         "fr"
     """
     if not accept_language:
-        return settings.DEFAULT_LANGUAGE
+        return _DEFAULT_LANGUAGE
 
-    # Parse the Accept-Language header
-    # Format: "en-US,en;q=0.9,fr;q=0.8"
-    languages = []
+    # Format: "en-US,en;q=0.9,fr;q=0.8". One pass keeps the first supported
+    # language with the highest quality value.
+    best_lang = _DEFAULT_LANGUAGE
+    best_quality = -1.0
     for lang_entry in accept_language.split(","):
-        parts = lang_entry.strip().split(";")
-        lang = parts[0].split("-")[0].lower()  # Get base language code
+        lang, _sep, params = lang_entry.partition(";")
+        lang = lang.strip().split("-")[0].lower()  # Get base language code
+        if lang not in _SUPPORTED_LANGUAGES:
+            continue
 
         # Get quality value (default to 1.0)
         quality = 1.0
-        if len(parts) > 1:
+        if params:
             try:
-                quality = float(parts[1].split("=")[1])
+                quality = float(params.split("=")[1])
             except (IndexError, ValueError):
                 pass
 
-        languages.append((lang, quality))
-
-    # Sort by quality (highest first)
-    languages.sort(key=lambda x: x[1], reverse=True)
+        if quality > best_quality:
+            best_lang, best_quality = lang, quality
 
-    # Find first supported language
-    for lang, _ in languages:
-        if lang in settings.SUPPORTED_LANGUAGES:
-            return lang
-
-    return settings.DEFAULT_LANGUAGE
+    return best_lang
 
 
 def ngettext(singular: str, plural: str, n: int, **kwargs) -> str:
@@ -197,16 +285,13 @@ def ngettext(singular: str, plural: str, n: int, **kwargs) -> str:
     Example:
         >>> ngettext("You have {n} message", "You have {n} messages", count, n=count)
     """
-    lang = current_language.get()
-    translations = get_translations(lang)
-
-    if translations:
-        translated = translations.ngettext(singular, plural, n)
-    else:
-        translated = singular if n == 1 else plural
+    translated = _lookup_plural(current_language.get(), singular, plural, n)
 
     # Format the message with kwargs if provided
-    if kwargs:
-        translated = translated.format(**kwargs)
+    if not kwargs:
+        return translated
+    return _format_message(translated, singular if n == 1 else plural, kwargs)
+
 
-    return translated
+preload_translations()
+_DEFAULT_TRANSLATIONS = _TRANSLATIONS[_DEFAULT_LANGUAGE]
@@ -6,36 +6,59 @@ logger.remove()
 
 LOG_DIR = Path(__file__).parent.parent / "logs"
 
-LOG_FORMAT = (
+DEBUG_FORMAT = (
     "{time:YYYY-MM-DD HH:mm:ss.SSS} | "
     "{level: <8} | "
     "{name}:{function}:{line} | "
     "{message}"
 )
 
-logger.add(
-    sink=str(LOG_DIR / "debug.log"),
-    format=LOG_FORMAT,
-    level="DEBUG" if settings.ENVIRONMENT == "development" else "INFO",
-    filter=lambda record: record["level"].no <= logger.level("WARNING").no,
-    rotation="10 MB",
-    retention="30 days",
-    compression="zip",
-    enqueue=True,
-)
+PROD_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name} | {message}"
+
+LOG_FORMAT = DEBUG_FORMAT if settings.ENVIRONMENT == "development" else PROD_FORMAT
+
+_WARNING_NO = logger.level("WARNING").no
+
+if settings.ENVIRONMENT == "development":
+    logger.add(
+        sink=str(LOG_DIR / "debug.log"),
+        format=LOG_FORMAT,
+        level="DEBUG",
+        filter=lambda record: record["level"].no <= _WARNING_NO,
+        rotation="10 MB",
+        retention="30 days",
+        compression="zip",
+        enqueue=True,
+    )
+else:
+    # One JSON line per record, serialized once; no DEBUG records are built
+    logger.add(
+        sink=str(LOG_DIR / "app.log"),
+        format=LOG_FORMAT,
+        level="INFO",
+        filter=lambda record: record["level"].no <= _WARNING_NO,
+        serialize=True,
+        rotation="10 MB",
+        retention="30 days",
+        compression="zip",
+        enqueue=True,
+    )
 
 logger.add(
     sink=str(LOG_DIR / "error.log"),
-    format=LOG_FORMAT,
+    # Errors are rare enough to always keep the call site
+    format=DEBUG_FORMAT,
     level="ERROR",
     rotation="10 MB",
     retention="30 days",
     compression="zip",
     backtrace=True,
-    diagnose=True,
+    # Rendering the values of locals on every error is only worth it while developing
+    diagnose=settings.ENVIRONMENT != "production",
     enqueue=True,
 )
 
 
 def get_logger():
     return logger
+
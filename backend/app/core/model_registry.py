@@ -1,41 +1,71 @@
 import importlib
 import os
 import pathlib
+import sys
 
+from backend.app.core.config import settings
 from backend.app.core.logging import get_logger
 
 logger = get_logger()
 
 
+_EXCLUDED_DIRS = frozenset(
+    {"venv", ".venv", "__pycache__", ".pytest_cache", ".git", "node_modules"}
+)
+
+
 def discover_models() -> list[str]:
     """Discover all models.py files in the application and return their module paths."""
     models_modules = []
     root_path = pathlib.Path(__file__).parent.parent
-    logger.debug(f"Scanning for model modules in root path: {root_path}")
+    logger.debug("Scanning for model modules in root path: {}", root_path)
 
-    for root, _, files in os.walk(root_path):
-        if any(excluded in root for excluded in ["venv", "__pycache__", "pytest_cache"]):
-            continue
+    # Depth-first scandir walk; excluded directories are never entered
+    stack: list[tuple[str, tuple[str, ...]]] = [(str(root_path), ())]
+    while stack:
+        directory, parts = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _EXCLUDED_DIRS:
+                        stack.append((entry.path, parts + (entry.name,)))
+                elif entry.name == "models.py":
+                    module_path = "backend.app." + ".".join(parts + ("models",))
+                    models_modules.append(module_path)
+                    logger.debug("Discovered model file: {}", module_path)
 
-        if "models.py" in files:
-            relative_path = pathlib.Path(root).relative_to(root_path)
-            module_path = "backend.app." + ".".join(relative_path.parts + ("models",))
-            models_modules.append(module_path)
-            logger.debug(f"Discovered model file: {module_path}")
-    
+    # Import order does not depend on the directory listing order
+    models_modules.sort()
     return models_modules
-    
+
 
 def load_models() -> None:
-    modules = discover_models()
+    # An explicit module list (e.g. in production images) skips the scan
+    if settings.MODEL_MODULES:
+        modules = [
+            module.strip()
+            for module in settings.MODEL_MODULES.split(",")
+            if module.strip()
+        ]
+    else:
+        modules = discover_models()
     if not modules:
         logger.warning("No model modules found to load.")
     else:
         logger.info(f"Successfully loaded {len(modules)} model modules.")
-    
+
+    failures = []
     for module_path in modules:
+        # Already imported, e.g. by a previous load in the same process
+        if module_path in sys.modules:
+            continue
         try:
             importlib.import_module(module_path)
-            logger.debug(f"Imported model module: {module_path}")
+            logger.debug("Imported model module: {}", module_path)
         except ImportError as e:
-            logger.error(f"Failed to import model module {module_path}: {e}")
\ No newline at end of file
+            failures.append(f"{module_path}: {e}")
+
+    if failures:
+        logger.error(
+            f"Failed to import {len(failures)} model modules:\n" + "\n".join(failures)
+        )
@@ -0,0 +1,66 @@
+"""
+In-memory token-bucket rate limiting for unauthenticated, expensive endpoints.
+"""
+
+import math
+import time
+
+from cachetools import TTLCache
+from fastapi import HTTPException, Request, status
+
+from backend.app.core.config import settings
+from backend.app.core.i18n import _
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+
+
+def _parse_rate(rate: str) -> tuple[int, int]:
+    """Parse a '<count>/<period>' rate such as '10/minute'."""
+    count, period = rate.split("/", 1)
+    return int(count), _PERIODS[period.strip()]
+
+
+class TokenBucketRateLimiter:
+    """
+    Per-client token bucket: up to ``capacity`` requests in a burst, refilled
+    at ``capacity`` tokens per ``period`` seconds.
+
+    Buckets idle for a full period are back to capacity, so they are dropped
+    from the TTL cache; the cache size bounds memory under spoofed-IP floods.
+    Bucket updates are synchronous and therefore atomic on the event loop.
+    """
+
+    def __init__(self, rate: str, max_clients: int = 100_000) -> None:
+        self.capacity, self.period = _parse_rate(rate)
+        self.refill_rate = self.capacity / self.period
+        self._buckets: TTLCache = TTLCache(maxsize=max_clients, ttl=self.period)
+
+    def acquire(self, key: str) -> float:
+        """Take a token for ``key``; return 0 if allowed, else seconds to wait."""
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.refill_rate)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / self.refill_rate
+        self._buckets[key] = (tokens - 1, now)
+        return 0
+
+
+auth_rate_limiter = TokenBucketRateLimiter(settings.AUTH_RATE_LIMIT)
+
+
+async def auth_rate_limit(request: Request) -> None:
+    """Router dependency rejecting clients that exceed AUTH_RATE_LIMIT with a 429."""
+    client = request.client.host if request.client else "unknown"
+    retry_after = auth_rate_limiter.acquire(client)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "status": "error",
+                "message": _("Too many requests."),
+                "action": _("Please wait a moment and try again."),
+            },
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
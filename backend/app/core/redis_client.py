@@ -0,0 +1,20 @@
+from redis.asyncio import Redis
+
+from backend.app.core.config import settings
+
+# Shared async client for application caches. It shares the Redis instance
+# used by the Celery result backend; the connection pool is created lazily.
+redis_client = Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    decode_responses=True,
+    socket_connect_timeout=1,
+    socket_timeout=1,
+    # Idle pooled connections are re-checked before reuse
+    health_check_interval=30,
+)
+
+
+async def close_redis() -> None:
+    await redis_client.aclose()
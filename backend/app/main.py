@@ -1,5 +1,6 @@
 import time
 import asyncio
+from bisect import bisect_right
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, status
@@ -7,19 +8,28 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 
 from backend.app.api.main import api_router
+from backend.app.auth.utils import (
+    argon2_library_path,
+    start_kdf_pool,
+    shutdown_kdf_pool,
+)
 from backend.app.core.config import settings
-from backend.app.core.db import init_db, engine
+from backend.app.core.db import init_db, engine, warm_pool
 from backend.app.core.logging import get_logger
 from backend.app.core.health import health_checker, ServiceStatus
-from backend.app.core.middleware import LanguageMiddleware
+from backend.app.core.redis_client import close_redis, redis_client
+from backend.app.core.middleware import DBSessionMiddleware, LanguageMiddleware
 
 logger = get_logger()
 
+# (elapsed seconds, wait seconds): back off further the longer startup takes
+_RETRY_SCHEDULE = ((0, 1), (10, 2), (20, 5), (30, 10), (40, 15))
+_RETRY_AFTER = [elapsed for elapsed, _ in _RETRY_SCHEDULE]
+
 
 async def startup_health_check(timeout: float = 90.0) -> bool:
     try:
         async with asyncio.timeout(timeout):
-            retry_intervals = [1, 2, 5, 10, 15]
             start_time = time.time()
 
             while True:
@@ -30,9 +40,9 @@ async def startup_health_check(timeout: float = 90.0) -> bool:
                 if elapsed_time >= timeout:
                     logger.error("Services failed health check within startup timeout")
                     return False
-                wait_time = retry_intervals[
-                    min(len(retry_intervals) - 1, int(elapsed_time / 10))
-                ]
+                wait_time = _RETRY_SCHEDULE[
+                    bisect_right(_RETRY_AFTER, elapsed_time) - 1
+                ][1]
                 logger.warning(
                     f"Services not healthy yet, waiting {wait_time} seconds before retrying..."
                 )
@@ -42,14 +52,32 @@ async def startup_health_check(timeout: float = 90.0) -> bool:
         return False
 
 
+async def _warm_redis() -> None:
+    try:
+        await redis_client.ping()
+    except Exception as e:
+        logger.warning(f"Redis warm-up failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     try:
         await init_db()
         logger.info("Database initialized successfully")
-        await health_checker.add_service("database", health_checker.check_database)
-        await health_checker.add_service("redis", health_checker.check_redis)
-        await health_checker.add_service("celery", health_checker.check_celery)
+        start_kdf_pool()
+        # The image links a system libargon2 with the SIMD memory fill; a bundled
+        # copy here means the bindings were installed from a generic wheel
+        logger.info(
+            "Argon2 library: {}", argon2_library_path() or "bundled with bindings"
+        )
+        # Register the checks while the DB and Redis pools open their connections
+        await asyncio.gather(
+            health_checker.add_service("database", health_checker.check_database),
+            health_checker.add_service("redis", health_checker.check_redis),
+            health_checker.add_service("celery", health_checker.check_celery),
+            warm_pool(),
+            _warm_redis(),
+        )
 
         if not await startup_health_check():
             raise RuntimeError("Critical services failed to start")
@@ -64,6 +92,10 @@ async def lifespan(app: FastAPI):
         logger.info("Application shutdown complete")
         await engine.dispose()
         await health_checker.cleanup()
+        shutdown_kdf_pool()
+        await close_redis()
+        # Sinks write from loguru's background worker; drain it before exiting
+        await logger.complete()
 
 
 app = FastAPI(
@@ -75,6 +107,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Release request-scoped database sessions (innermost, runs in the handler's task)
+app.add_middleware(DBSessionMiddleware)
+
 # Add Language/i18n middleware
 app.add_middleware(LanguageMiddleware)
 
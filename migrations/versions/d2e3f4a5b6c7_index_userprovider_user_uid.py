@@ -0,0 +1,42 @@
+"""index_userprovider_user_uid
+
+Index ``userprovider.user_uid``. Lookups by ``user.email`` and ``user.id_no``
+are already served by their unique indexes, and ``(provider, provider_id)``
+by ``uq_user_providers_provider_provider_id``; the foreign key column was the
+only hot one without an index, which also made ``ON DELETE CASCADE`` from
+``user`` scan the whole table.
+
+Built ``CONCURRENTLY`` so the table stays writable during the migration.
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "d2e3f4a5b6c7"
+down_revision: Union[str, None] = "c1d2e3f4a5b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_userprovider_user_uid"),
+            "userprovider",
+            ["user_uid"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_userprovider_user_uid"),
+            table_name="userprovider",
+            postgresql_concurrently=True,
+        )
@@ -5,6 +5,7 @@ Run this after updating .po translation files.
 """
 
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from babel.messages.mofile import write_mo
 from babel.messages.pofile import read_po
@@ -16,6 +17,26 @@ sys.path.insert(0, str(project_root))
 LOCALES_DIR = project_root / "backend" / "app" / "locales"
 
 
+def _compile_one(po_file: Path) -> tuple[Path, str | None]:
+    """Compile one .po file to .mo; returns the file and an error message, if any."""
+    try:
+        # Create corresponding .mo file path
+        mo_file = po_file.with_suffix(".mo")
+
+        # Read .po file
+        with open(po_file, "rb") as f:
+            catalog = read_po(f, locale=po_file.parent.parent.name)
+
+        # Write .mo file
+        with open(mo_file, "wb") as f:
+            write_mo(f, catalog)
+
+        return po_file, None
+
+    except Exception as e:
+        return po_file, f"Error compiling {po_file}: {e}"
+
+
 def compile_translations():
     """Compile all .po files to .mo files."""
     print("Compiling translation files...")
@@ -34,29 +55,21 @@ def compile_translations():
         print(f"No .po files found in {LOCALES_DIR}")
         return
 
-    for po_file in po_files:
-        try:
-            # Create corresponding .mo file path
-            mo_file = po_file.with_suffix(".mo")
+    # Parsing dominates and every file is independent, so compile in parallel
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(_compile_one, po_files))
 
-            print(
-                f"Compiling: {po_file.relative_to(project_root)} -> {mo_file.relative_to(project_root)}"
-            )
-
-            # Read .po file
-            with open(po_file, "rb") as f:
-                catalog = read_po(f, locale=po_file.parent.parent.name)
-
-            # Write .mo file
-            with open(mo_file, "wb") as f:
-                write_mo(f, catalog)
-
-            compiled_count += 1
-
-        except Exception as e:
-            error_msg = f"Error compiling {po_file}: {e}"
+    for po_file, error_msg in results:
+        if error_msg:
             errors.append(error_msg)
             print(f"✗ {error_msg}")
+            continue
+
+        mo_file = po_file.with_suffix(".mo")
+        print(
+            f"Compiled: {po_file.relative_to(project_root)} -> {mo_file.relative_to(project_root)}"
+        )
+        compiled_count += 1
 
     print(f"\n{'=' * 60}")
     print(f"✓ Successfully compiled {compiled_count} translation file(s)")